@@ -0,0 +1,201 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'main'))
+
+from battleship import Board, Cell, Game, Ship  # noqa: E402
+
+# Slowdown over the baseline, as a fraction of its time per operation, reported as a regression
+DEFAULT_THRESHOLD = 0.10
+
+# Slowdown in microseconds per operation below which nothing is reported, timer noise of sub-microsecond benchmarks
+# easily goes over the threshold alone
+DEFAULT_MIN_DELTA_US = 0.1
+
+# Timed runs of every benchmark, the fastest one is kept
+REPEATS = 5
+
+
+def bench_cell_construction(n: int):
+    start = time.perf_counter()
+    for _ in range(n):
+        Cell('B', 4)
+    return n, time.perf_counter() - start
+
+
+def bench_board_construction(n: int):
+    """ Board() drawing its random ship, the ship is only placed on the board by place_ship"""
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(n):
+        Board(rng)
+    return n, time.perf_counter() - start
+
+
+def bench_get_cell(n: int):
+    board = Board(rng=0)
+    board.place_ship()
+    cells = [(col, row) for row in Board.rows for col in Board.columns]
+    start = time.perf_counter()
+    for _ in range(n // len(cells)):
+        for col, row in cells:
+            board.get_cell(col, row)
+    return n // len(cells) * len(cells), time.perf_counter() - start
+
+
+def bench_ship_init(n: int):
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(n):
+        Ship(rng)
+    return n, time.perf_counter() - start
+
+
+def bench_play_round(n: int):
+    """ Rounds of games already set up, game construction is not timed"""
+    rng = random.Random(0)
+    rounds = 0
+    elapsed = 0.0
+    while rounds < n:
+        game = Game(verbose=False, rng=rng)
+        start = time.perf_counter()
+        while not game.is_over:
+            game.play_round()
+        elapsed += time.perf_counter() - start
+        rounds += game.round
+    return rounds, elapsed
+
+
+def bench_full_game(n: int):
+    """ Whole games, construction included"""
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(n):
+        game = Game(verbose=False, rng=rng)
+        while not game.is_over:
+            game.play_round()
+    return n, time.perf_counter() - start
+
+
+def bench_board_repr(n: int):
+    """ Full board print, the render cache is dropped before every print"""
+    board = Board(rng=0)
+    board.place_ship()
+    for index in range(0, 64, 3):
+        board.shoot(index)
+    start = time.perf_counter()
+    for _ in range(n):
+        board.invalidate_render()
+        repr(board)
+    return n, time.perf_counter() - start
+
+
+# Benchmark functions, with the operations they run by default
+BENCHMARKS = {
+    'cell_construction': (bench_cell_construction, 200000),
+    'board_construction': (bench_board_construction, 50000),
+    'get_cell': (bench_get_cell, 200000),
+    'ship_init': (bench_ship_init, 50000),
+    'play_round': (bench_play_round, 100000),
+    'full_game': (bench_full_game, 2000),
+    'board_repr': (bench_board_repr, 20000),
+}
+
+
+def run_benchmark(name: str, scale: float = 1.0, repeats: int = REPEATS):
+    """
+    :param scale: fraction of the default number of operations to run
+    :return: result of the fastest run, as {'ops', 'seconds', 'us_per_op', 'ops_per_second'}
+    """
+    function, default_ops = BENCHMARKS[name]
+    ops = max(1, int(default_ops * scale))
+    best = None
+    for _ in range(repeats):
+        done, seconds = function(ops)
+        if best is None or seconds / done < best[1] / best[0]:
+            best = (done, seconds)
+    done, seconds = best
+    return {'ops': done, 'seconds': seconds, 'us_per_op': seconds / done * 1e6,
+            'ops_per_second': done / seconds if seconds else float('inf')}
+
+
+def run_suite(names=None, scale: float = 1.0, repeats: int = REPEATS):
+    """ Run benchmarks, all of them by default, return the report saved as JSON"""
+    names = list(BENCHMARKS) if names is None else names
+    for name in names:
+        if name not in BENCHMARKS:
+            raise Exception('Benchmark {} must be in allowed benchmarks list {}'.format(name, list(BENCHMARKS)))
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': {name: run_benchmark(name, scale, repeats) for name in names},
+    }
+
+
+def compare(baseline, report, threshold: float = DEFAULT_THRESHOLD, min_delta_us: float = DEFAULT_MIN_DELTA_US):
+    """
+    :param threshold: slowdown reported, as a fraction of the baseline time per operation
+    :param min_delta_us: slowdown reported, in microseconds per operation
+    :return: {name: (baseline us per op, current us per op, change)} for the benchmarks of both reports slower than
+    the baseline by more than both threshold and min_delta_us
+    """
+    regressions = {}
+    for name, result in report['results'].items():
+        if name not in baseline['results']:
+            continue
+        before = baseline['results'][name]['us_per_op']
+        after = result['us_per_op']
+        change = after / before - 1
+        if change > threshold and after - before > min_delta_us:
+            regressions[name] = (before, after, change)
+    return regressions
+
+
+def print_report(report, baseline=None):
+    for name, result in report['results'].items():
+        line = '{:<18} {:12.3f} us/op {:14,.0f} ops/s'.format(name, result['us_per_op'], result['ops_per_second'])
+        if baseline is not None and name in baseline['results']:
+            line += ' {:+8.1%}'.format(result['us_per_op'] / baseline['results'][name]['us_per_op'] - 1)
+        print(line)
+
+
+if __name__ == '__main__':
+    # python src/benchmark/benchmark_suite.py --output new.json --baseline old.json
+    parser = argparse.ArgumentParser(description='Time the object model, rendering and simulation throughput')
+    parser.add_argument('benchmarks', nargs='*', help='benchmarks to run, all by default: {}'.format(
+        ', '.join(BENCHMARKS)))
+    parser.add_argument('--output', help='JSON file to save the results to')
+    parser.add_argument('--baseline', help='JSON file of earlier results to compare with')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='slowdown reported as a regression, 0.1 for 10%% (default)')
+    parser.add_argument('--min-delta-us', type=float, default=DEFAULT_MIN_DELTA_US,
+                        help='smallest slowdown reported, in us per operation, {} by default'.format(
+                            DEFAULT_MIN_DELTA_US))
+    parser.add_argument('--scale', type=float, default=1.0, help='fraction of the default operations to run')
+    parser.add_argument('--repeats', type=int, default=REPEATS, help='runs per benchmark, the fastest is kept')
+    args = parser.parse_args()
+
+    baseline_report = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline_report = json.load(baseline_file)
+
+    suite_report = run_suite(args.benchmarks or None, args.scale, args.repeats)
+    print_report(suite_report, baseline_report)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(suite_report, output_file, indent=2)
+
+    if baseline_report is not None:
+        slower = compare(baseline_report, suite_report, args.threshold, args.min_delta_us)
+        for benchmark, (before_us, after_us, slowdown) in slower.items():
+            print('Regression: {} {:.3f} -> {:.3f} us/op ({:+.1%})'.format(benchmark, before_us, after_us, slowdown))
+        sys.exit(1 if slower else 0)
@@ -0,0 +1,37 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'main'))
+
+from battleship import Game  # noqa: E402
+
+
+def play_games(n_games: int, replacement: bool, seed: int = 0):
+    """
+    :return: (mean rounds per game, wall time per game in microseconds)
+    """
+    rng = random.Random(seed)
+    rounds = 0
+    start = time.perf_counter()
+    for _ in range(n_games):
+        game = Game(verbose=False, rng=rng, replacement=replacement)
+        while not game.is_over:
+            game.play_round()
+        rounds += game.round - 1
+    elapsed = time.perf_counter() - start
+    return rounds / n_games, elapsed / n_games * 1e6
+
+
+if __name__ == '__main__':
+    # python src/benchmark/targeting_benchmark.py [n_games]
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    results = {replacement: play_games(games, replacement) for replacement in [True, False]}
+    for replacement, (mean_rounds, micros) in results.items():
+        print('{:<22} {:8.2f} rounds/game {:10.1f} us/game'.format(
+            'with replacement' if replacement else 'without replacement', mean_rounds, micros))
+
+    print('Rounds reduction: {:.1%}, time reduction: {:.1%}'.format(
+        1 - results[False][0] / results[True][0], 1 - results[False][1] / results[True][1]))
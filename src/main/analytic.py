@@ -0,0 +1,148 @@
+from math import comb
+
+from battleship import Board
+from simulation import PLAYER_1, PLAYER_2
+
+# Probability mass left out of an unbounded distribution, shooting with replacement never surely sinks a ship
+DEFAULT_TOLERANCE = 1e-12
+
+
+def sink_distribution(cells: int, ship_length: int = 3, replacement: bool = True,
+                      tolerance: float = DEFAULT_TOLERANCE):
+    """
+    Distribution of the shot that sinks a ship when shooting uniformly random cells of a board.
+    Every cell is equally likely on every shot, so the distribution only depends on the numbers of cells, never on
+    where the ship lies: all placements give the same answer.
+    With replacement the ship sinks once all of its cells were drawn, P(sunk by t) follows from inclusion-exclusion
+    over the ship cells never drawn. Without replacement the shots are a random order of the cells and the ship sinks
+    on the position of its last cell: P(sunk on t) = C(t - 1, L - 1) / C(cells, L).
+    :param cells: number of cells of the board
+    :param ship_length: cells covered by the ship
+    :param tolerance: with replacement, stop once the ship is afloat with a lower probability
+    :return: list of probabilities indexed by shot number, index 0 is always 0
+    """
+    if not 1 <= ship_length <= cells:
+        raise Exception('Ship length {} must be between 1 and the {} cells of the board'.format(ship_length, cells))
+
+    if not replacement:
+        total = comb(cells, ship_length)
+        return [0.0] + [comb(shot - 1, ship_length - 1) / total for shot in range(1, cells + 1)]
+
+    # P(afloat after t shots) = P(some ship cell never drawn) = sum over j >= 1 of (-1)^(j+1) C(L, j) (1 - j/cells)^t
+    terms = [((-1) ** (j + 1) * comb(ship_length, j), 1 - j / cells) for j in range(1, ship_length + 1)]
+    probabilities = [0.0]
+    afloat = 1.0
+    shot = 0
+    while afloat > tolerance:
+        shot += 1
+        # Fewer shots than ship cells cannot sink it, skipping them also avoids cancellation noise
+        still_afloat = 1.0 if shot < ship_length else min(afloat, sum(c * base ** shot for c, base in terms))
+        probabilities.append(afloat - still_afloat)
+        afloat = still_afloat
+    return probabilities
+
+
+class OutcomeDistribution:
+    """
+    Exact outcome of games with random shots on both sides, under the rules of Game.play_round: a random first
+    shooter, both players fire once per round at independent boards, and player 1's ship is checked first, so
+    player 2 wins when both ships sink in the same round.
+    """
+    def __init__(self, width: int = len(Board.columns), height: int = len(Board.rows), ship_length: int = 3,
+                 replacement: bool = True, tolerance: float = DEFAULT_TOLERANCE):
+        if ship_length > max(width, height):
+            raise Exception('Ship length {} must fit on a {}x{} board'.format(ship_length, width, height))
+        self._width = width
+        self._height = height
+        self._ship_length = ship_length
+        self._replacement = replacement
+        self._sink = sink_distribution(width * height, ship_length, replacement, tolerance)
+
+        # Game ends on round r when both ships were afloat after r - 1 rounds and one of them sinks on round r
+        self._rounds = {}
+        self._wins = {PLAYER_1: 0.0, PLAYER_2: 0.0}
+        self._tie_rate = 0.0
+        afloat = 1.0
+        for round_number, sinks in enumerate(self._sink):
+            if not sinks:
+                continue
+            still_afloat = afloat - sinks
+            self._rounds[round_number] = afloat * afloat - still_afloat * still_afloat
+            # Player 1 loses whenever their ship sinks while player 2's was afloat at the start of the round
+            self._wins[PLAYER_2] += sinks * afloat
+            self._wins[PLAYER_1] += sinks * still_afloat
+            self._tie_rate += sinks * sinks
+            afloat = still_afloat
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def ship_length(self):
+        return self._ship_length
+
+    @property
+    def replacement(self):
+        return self._replacement
+
+    @property
+    def sink(self):
+        """ Probability that one board's ship sinks on each round, see sink_distribution"""
+        return self._sink
+
+    @property
+    def rounds(self):
+        """ Shooting rounds played until a ship sank -> probability, like SimulationResult.rounds"""
+        return self._rounds
+
+    @property
+    def wins(self):
+        """ Win probability of PLAYER_1 and PLAYER_2"""
+        return self._wins
+
+    @property
+    def tie_rate(self):
+        """ Probability that both ships sink in the same round, every such game goes to player 2"""
+        return self._tie_rate
+
+    @property
+    def first_shooter_win_rate(self):
+        # Players are equally likely to shoot first, and the order of shots within a round changes nothing
+        return (self._wins[PLAYER_1] + self._wins[PLAYER_2]) / 2
+
+    @property
+    def first_shooter_advantage(self):
+        return self.first_shooter_win_rate - 0.5
+
+    @property
+    def mean_rounds(self):
+        return sum(round_number * probability for round_number, probability in self._rounds.items())
+
+    def compare(self, result):
+        """
+        Distance from the frequencies of a simulation.SimulationResult
+        :return: {'player_1_win_rate', 'first_shooter_win_rate', 'mean_rounds': simulated minus exact,
+        'rounds': total variation distance between the distributions of rounds}
+        """
+        games = result.games
+        if not games:
+            raise Exception('Simulation result must hold at least one game')
+        observed = {round_number: count / games for round_number, count in result.rounds.items()}
+        return {
+            'player_1_win_rate': result.wins[PLAYER_1] / games - self._wins[PLAYER_1],
+            'first_shooter_win_rate': result.first_shooter_win_rate - self.first_shooter_win_rate,
+            'mean_rounds': result.mean_rounds - self.mean_rounds,
+            'rounds': sum(abs(observed.get(round_number, 0.0) - self._rounds.get(round_number, 0.0))
+                          for round_number in set(observed) | set(self._rounds)) / 2,
+        }
+
+    def __repr__(self):
+        return ('OutcomeDistribution({}x{}, replacement={}, wins={}, first_shooter_win_rate={:.4f}, '
+                'mean_rounds={:.2f})').format(self.width, self.height, self.replacement,
+                                              {player: round(rate, 6) for player, rate in self.wins.items()},
+                                              self.first_shooter_win_rate, self.mean_rounds)
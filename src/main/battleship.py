@@ -1,17 +1,21 @@
 import random
-from tools import colored, colored_background
+import sys
+import tools
+from tools import SEED_TYPES, build_cell_prints, draw_unshot, make_rng
 
 
 class Cell:
     """ A single cell on the board. For example: A1, column A at row 1, can be hit or not, part of ship or not"""
+    __slots__ = ['_col', '_row', '_hit', '_part', '_board', '_index']
+
     def __init__(self, col: str, row: int, hit: bool = False, part: str = None):
         # Column choices: ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
-        if col not in Board.columns:
+        if col not in Board.COLUMN_SET:
             raise Exception('Col {} must be in allowed columns list {}'.format(col, Board.columns))
         self._col = col
 
         # Row choices: [1, 2, 3, 4, 5, 6, 7, 8]
-        if row not in Board.rows:
+        if row not in Board.ROW_SET:
             raise Exception('Row {} must be in allowed rows list {}'.format(row, Board.rows))
         self._row = row
 
@@ -23,11 +27,9 @@ class Cell:
             raise Exception('Part {} is not in allowed ship parts list {}'.format(part, Ship.SHIP_PARTS))
         self._part = part
 
-        # Coordinates of neighboring cells, tuple (col, row)
-        self._above = self.default_above()
-        self._below = self.default_below()
-        self._before = self.default_before()
-        self._after = self.default_after()
+        # Board this cell is a view of, once placed on it. Hit and part are then read from the board state
+        self._board = None
+        self._index = None
 
     @property
     def col(self):
@@ -45,90 +47,120 @@ class Cell:
     def row(self, row):
         self._row = row
 
+    # Coordinates of neighboring cells, tuple (col, row), shared by every cell at the same place through NEIGHBORS
     @property
     def above(self):
-        return self._above
+        return NEIGHBORS[Board.cell_index(self._col, self._row)][0]
 
     @property
     def below(self):
-        return self._below
+        return NEIGHBORS[Board.cell_index(self._col, self._row)][1]
 
     @property
     def before(self):
-        return self._before
+        return NEIGHBORS[Board.cell_index(self._col, self._row)][2]
 
     @property
     def after(self):
-        return self._after
+        return NEIGHBORS[Board.cell_index(self._col, self._row)][3]
 
     @property
     def hit(self):
+        if self._board is not None:
+            return self._board.is_hit(self._index)
         return self._hit
 
     @hit.setter
     def hit(self, hit):
+        if self._board is not None:
+            self._board.set_hit(self._index, hit)
         self._hit = hit
 
     @property
     def part(self):
+        if self._board is not None:
+            return self._board.get_part(self._index)
         return self._part
 
     @part.setter
     def part(self, part):
+        if self._board is not None:
+            self._board.set_part(self._index, part)
         self._part = part
 
+    @property
+    def board(self):
+        return self._board
+
+    def bind(self, board, index: int):
+        """ Make this cell a view of the board state at index"""
+        self._board = board
+        self._index = index
+
+    def unbind(self):
+        """ Detach the cell from its board, keeping the state it had when it was replaced"""
+        if self._board is not None:
+            self._hit = self.hit
+            self._part = self.part
+            self._board = None
+            self._index = None
+
     def default_above(self):
         """ Cell is above current cell, must be on the same column"""
         above_row = self.row - 1
-        if above_row in Board.rows:
+        if above_row in Board.ROW_SET:
             return self.col, above_row
 
     def default_below(self):
         """ Cell is below current cell, must be on the same column"""
         below_row = self.row + 1
-        if below_row in Board.rows:
+        if below_row in Board.ROW_SET:
             return self.col, below_row
 
     def default_before(self):
         """ Cell is before current cell, must be on the same row"""
-        before_col_index = Board.columns.index(self.col) - 1
+        before_col_index = Board.COLUMN_INDEXES[self.col] - 1
         if 0 <= before_col_index <= 7:
             return Board.columns[before_col_index], self.row
 
     def default_after(self):
         """ Cell is after current cell, must be on the same row"""
-        after_col_index = Board.columns.index(self.col) + 1
+        after_col_index = Board.COLUMN_INDEXES[self.col] + 1
         if 0 <= after_col_index <= 7:
             return Board.columns[after_col_index], self.row
 
     def __repr__(self):
-        part = 'n'
-        if self.part == 'Front':
-            part = 'f'
-        elif self.part == 'Middle':
-            part = 'm'
-        elif self.part == 'Rear':
-            part = 'r'
-        if self.part:
-            return colored(
-                colored_background(
-                    '{}{}[{}{}]'.format(
-                        self.col, self.row, part,
-                        colored('x', 'red') if self.hit else colored('o', 'green')), 'orange'), 'blue')
-        return '{}{}[{}{}]'.format(
-            self.col, self.row, part, colored('x', 'red') if self.hit else colored('o', 'green'))
+        return format_cell(self.col, self.row, self.part, self.hit)
 
     def __str__(self):
         return self.__repr__()
 
 
+def format_cell(col: str, row: int, part: str, hit: bool):
+    """ Colored representation of a cell state, for example A1[fx] for the hit front of a ship on A1"""
+    return CELL_PRINTS[tools.color_enabled][Board.cell_index(col, row)][Board.PART_CODES.get(part, 0)][bool(hit)]
+
+
 class Ship:
     """ A ship is combination of 3 cells that can be vertically or horizontally placed, respectively of type 1 or 2 """
     SHIP_PARTS = ['Front', 'Middle', 'Rear']
 
-    def __init__(self):
-        self._type = random.choice(Board.SHIP_PLACEMENTS)
-        self._middle = self.find_middle_cell()
+    __slots__ = ['_type', '_middle', '_front', '_rear', '_sunk']
+
+    def __init__(self, rng=None, placement: int = None):
+        """
+        :param rng: random.Random instance or seed drawing the placement, the random module by default
+        :param placement: index of the placement in PLACEMENT_CELLS, to place the ship there instead of at random
+        """
+        if placement is None:
+            rng = make_rng(rng)
+            self._type = rng.choice(Board.SHIP_PLACEMENTS)
+            self._middle = self.find_middle_cell(rng)
+        else:
+            self._type = PLACEMENT_TYPES[placement]
+            middle_index = PLACEMENT_CELLS[placement][1]
+            self._middle = Cell(Board.columns[middle_index % len(Board.columns)],
+                                middle_index // len(Board.columns) + 1, part='Middle')
         self._front = self.find_front_cell(self.middle)
         self._rear = self.find_rear_cell(self.middle)
         self._sunk = False
@@ -173,6 +205,12 @@ class Ship:
     def rear(self, rear):
         self._rear = rear
 
+    @property
+    def placement(self):
+        """ Index of the ship placement in PLACEMENT_CELLS"""
+        return PLACEMENT_IDS[tuple(Board.cell_index(cell.col, cell.row)
+                                   for cell in [self.front, self.middle, self.rear])]
+
     def sink(self):
         """ A ship sinks when all of its parts have been hit"""
         if self.front.hit and self.middle.hit and self.rear.hit:
@@ -184,8 +222,9 @@ class Ship:
     def is_horizontal(self):
         return self.type == Board.HORIZONTAL
 
-    def find_middle_cell(self):
-        return Cell(Board.get_random_middle_col(self.type), Board.get_random_middle_row(self.type), part='Middle')
+    def find_middle_cell(self, rng=None):
+        return Cell(Board.get_random_middle_col(self.type, rng), Board.get_random_middle_row(self.type, rng),
+                    part='Middle')
 
     def find_front_cell(self, middle: Cell):
         if self.is_vertical():
@@ -224,6 +263,11 @@ class Board:
     # Rows eligible to house middle of the ship assuming vertical placement
     middle_rows = [2, 3, 4, 5, 6, 7]
 
+    # Index of every column letter, and sets of the columns and rows, so lookups never scan the lists above
+    COLUMN_INDEXES = {col: index for index, col in enumerate(columns)}
+    COLUMN_SET = frozenset(columns)
+    ROW_SET = frozenset(rows)
+
     # Vertical ship placement
     VERTICAL = 1
 
@@ -232,117 +276,471 @@ class Board:
 
     SHIP_PLACEMENTS = [VERTICAL, HORIZONTAL]
 
-    def __init__(self):
-        self._ship = Ship()
-        self._cells = self.initialize_board()
+    # Placement types by the letter a player types for them
+    ORIENTATIONS = {'V': VERTICAL, 'H': HORIZONTAL}
+
+    # Ship part codes kept per cell, 0 when the cell houses no ship part
+    PART_CODES = {'Front': 1, 'Middle': 2, 'Rear': 3}
+    PARTS_BY_CODE = [None, 'Front', 'Middle', 'Rear']
+
+    # Part codes of an empty board, immutable and shared by every board until it places a ship part
+    EMPTY_PARTS = bytes(len(columns) * len(rows))
+
+    # Random bits of a cell index, the 64 cells make every draw of that many bits a uniform cell
+    INDEX_BITS = (len(columns) * len(rows) - 1).bit_length()
+
+    __slots__ = ['_rng', '_ship', '_parts', '_shots', '_ship_mask', '_views', '_unshot', '_bulk_shots', '_shot_block',
+                 '_block_shots', '_fragments', '_row_prints', '_render', '_rendered_shots', '_rendered_color',
+                 '_changed_parts']
+
+    def __init__(self, rng=None, placement: int = None, bulk_shots: int = 0):
+        """
+        :param rng: random.Random instance or seed used for the ship placement and random shots, the random module by
+        default
+        :param placement: index of the ship placement in PLACEMENT_CELLS, a random placement when None
+        :param bulk_shots: random shots drawn at once by draw_random_index, 0 to draw every shot on its own
+        """
+        if bulk_shots < 0:
+            raise Exception('Bulk shots {} must be 0 or more'.format(bulk_shots))
+        self._rng = make_rng(rng)
+        self._ship = Ship(self._rng, placement)
+        self._parts = self.initialize_board()
+        self._shots = 0  # Bitboard of cells that have been hit, bit index row * 8 + col starting at A1
+        self._ship_mask = 0  # Bitboard of cells housing a ship part
+        self._views = {}  # Cell views handed out so far, by cell index
+        self._unshot = None  # Pool of cells not shot yet, built on the first draw without replacement
+        self._bulk_shots = bulk_shots
+        self._shot_block = 0  # Random shots drawn in bulk and not taken yet, INDEX_BITS each, the lowest first
+        self._block_shots = 0  # Shots left in the block
+
+        # Render cache: one string per cell and per row, plus the state they were rendered from
+        self._fragments = None
+        self._row_prints = None
+        self._render = None
+        self._rendered_shots = 0
+        self._rendered_color = None  # Color mode of the cached render
+        self._changed_parts = 0  # Bitboard of cells whose part changed since the last render
 
     @property
     def ship(self):
         return self._ship
 
+    @property
+    def rng(self):
+        return self._rng
+
+    @property
+    def bulk_shots(self):
+        return self._bulk_shots
+
+    @property
+    def parts(self):
+        """ Part code of every cell, the shared EMPTY_PARTS while no part was ever placed on the board"""
+        return self._parts
+
+    @property
+    def shots(self):
+        return self._shots
+
+    @shots.setter
+    def shots(self, shots: int):
+        self._shots = shots
+        self._unshot = None
+        self._ship.sunk = self.sunk
+
+    @property
+    def ship_mask(self):
+        return self._ship_mask
+
+    @property
+    def placement(self):
+        """ Index in PLACEMENT_CELLS of the ship placed on the board, None before place_ship"""
+        return PLACEMENTS_BY_MASK.get(self._ship_mask)
+
+    @property
+    def sunk(self):
+        """ Ship is sunk once every cell housing a part of it has been hit"""
+        return bool(self._ship_mask) and self._shots & self._ship_mask == self._ship_mask
+
     @property
     def cells(self):
-        return self._cells
+        """ Cells of the entire board by row, built from the board state"""
+        return {row: [self.get_cell(col, row) for col in self.columns] for row in self.rows}
 
     def initialize_board(self):
-        # Create cells for the entire board and track them in a dictionary
-        board_cells = {}
-        for row in self.rows:
-            row_cells = []  # all cells on one row, one for each column
-            for col in self.columns:
-                row_cells.append(Cell(col, row))
-            board_cells[row] = row_cells
-
-        return board_cells
-
-    def place_ship(self):
-        # Place all parts of the ship on the board
+        # Ship part code for every cell of the board, indexed row * 8 + col starting at A1. Copied on the first write
+        return self.EMPTY_PARTS
+
+    @classmethod
+    def cell_index(cls, col, row):
+        return (row - 1) * len(cls.columns) + cls.COLUMN_INDEXES[col]
+
+    @classmethod
+    def cell_coordinates(cls, index: int):
+        """ (col, row) of the cell at index"""
+        return CELL_COORDINATES[index]
+
+    @classmethod
+    def parse_cell(cls, label: str):
+        """ Index of the cell with a label like B4, any case"""
+        index = CELL_INDEXES.get(label.strip().upper())
+        if index is None:
+            raise Exception('Cell {} must be a column {} to {} followed by a row {} to {}'.format(
+                label, cls.columns[0], cls.columns[-1], cls.rows[0], cls.rows[-1]))
+        return index
+
+    @classmethod
+    def parse_placement(cls, front: str, orientation: str):
+        """
+        :param front: label of the cell housing the front of the ship, like B4
+        :param orientation: V for a ship running down from its front, H for one running right
+        :return: index of the placement in PLACEMENT_CELLS
+        """
+        placement_type = cls.ORIENTATIONS.get(orientation.strip().upper())
+        if placement_type is None:
+            raise Exception('Orientation {} must be in allowed orientations list {}'.format(
+                orientation, sorted(cls.ORIENTATIONS)))
+        index = cls.parse_cell(front)
+        step = len(cls.columns) if placement_type == cls.VERTICAL else 1
+        placement = PLACEMENT_IDS.get((index, index + step, index + 2 * step))
+        if placement is None:
+            raise Exception('Ship does not fit on the board with its front on {}'.format(front))
+        return placement
+
+    def shoot(self, index: int):
+        """ Mark the cell at index as hit, return True when it houses a ship part"""
+        bit = 1 << index
+        self._shots |= bit
+        return bool(self._ship_mask & bit)
+
+    def is_hit(self, index: int):
+        return bool(self._shots >> index & 1)
+
+    def set_hit(self, index: int, hit: bool):
+        if hit:
+            self._shots |= 1 << index
+        else:
+            self._shots &= ~(1 << index)
+
+    def get_part(self, index: int):
+        return self.PARTS_BY_CODE[self._parts[index]]
+
+    def set_part(self, index: int, part: str):
+        self._changed_parts |= 1 << index
+        if self._parts is self.EMPTY_PARTS:
+            self._parts = bytearray(self.EMPTY_PARTS)
+        if part:
+            self._parts[index] = self.PART_CODES[part]
+            self._ship_mask |= 1 << index
+        else:
+            self._parts[index] = 0
+            self._ship_mask &= ~(1 << index)
+
+    def place_ship(self, placement: int = None):
+        """ Place all parts of the ship on the board, moving it to placement first when one is given"""
+        if placement is not None:
+            self._ship = Ship(placement=placement)
         self.replace_cell_on_the_board(self.ship.front)
         self.replace_cell_on_the_board(self.ship.middle)
         self.replace_cell_on_the_board(self.ship.rear)
 
     @classmethod
-    def get_random_col(cls):
-        return random.choice(cls.columns)
+    def get_random_col(cls, rng=None):
+        return (random if rng is None else rng).choice(cls.columns)
 
     @classmethod
-    def get_random_row(cls):
-        return random.choice(cls.rows)
+    def get_random_row(cls, rng=None):
+        return (random if rng is None else rng).choice(cls.rows)
 
     @classmethod
-    def get_random_middle_row(cls, placement_type):
+    def get_random_middle_row(cls, placement_type, rng=None):
         """
         :param placement_type: Ship placement type. Either vertical (1) or horizontal (2)
+        :param rng: random.Random instance, the random module by default
         :return: row number
         """
 
         # For vertical placement,Row 1 and 8 are not eligible
         if placement_type == cls.VERTICAL:
-            return random.choice(cls.middle_rows)
+            return (random if rng is None else rng).choice(cls.middle_rows)
 
         if placement_type == cls.HORIZONTAL:
-            return cls.get_random_row()
+            return cls.get_random_row(rng)
 
     @classmethod
-    def get_random_middle_col(cls, placement_type):
+    def get_random_middle_col(cls, placement_type, rng=None):
         """
         :param placement_type: Ship placement type. Either vertical (1) or horizontal (2)
+        :param rng: random.Random instance, the random module by default
         :return: col alphabet
         """
 
         if placement_type == cls.VERTICAL:
-            return cls.get_random_col()
+            return cls.get_random_col(rng)
         # For horizontal placement, Col A and H are not eligible
         if placement_type == cls.HORIZONTAL:
-            return random.choice(cls.middle_columns)
+            return (random if rng is None else rng).choice(cls.middle_columns)
 
     def replace_cell_on_the_board(self, new_cell: Cell):
-        # Find row to place new cell
-        board_row = self.cells[new_cell.row]
+        index = self.cell_index(new_cell.col, new_cell.row)
 
-        # Find index of column
-        board_col_index = Board.columns.index(new_cell.col)
+        # Detach the cell previously handed out for this position
+        old_cell = self._views.get(index)
+        if old_cell is not None and old_cell is not new_cell:
+            old_cell.unbind()
 
-        # Put new cell at index
-        board_row[board_col_index] = new_cell
+        # Store the new cell state and make the new cell a view of it
+        new_cell.unbind()
+        self.set_hit(index, new_cell.hit)
+        self.set_part(index, new_cell.part)
+        new_cell.bind(self, index)
+        self._views[index] = new_cell
 
     def get_cell(self, col, row):
-        if col in self.columns and row in self.rows:
-            board_row = self.cells[row]
-            col_index = self.columns.index(col)
-            return board_row[col_index]
+        if col in self.COLUMN_SET and row in self.ROW_SET:
+            return self.get_cell_at(self.cell_index(col, row))
         else:
             raise Exception('Cell at col {} and row {} does not exist'.format(col, row))
 
     def get_random_cell(self):
-        return self.get_cell(self.get_random_col(), self.get_random_row())
+        return self.get_cell(self.get_random_col(self._rng), self.get_random_row(self._rng))
+
+    @classmethod
+    def get_random_index(cls, rng=None):
+        return (random if rng is None else rng).randrange(len(cls.columns) * len(cls.rows))
+
+    def draw_random_index(self):
+        """
+        Random cell for a shot with replacement, from the board's rng. With bulk_shots, one getrandbits call draws
+        that many shots at once and the next ones are sliced off the block
+        """
+        if not self._block_shots:
+            if not self._bulk_shots:
+                return self._rng.randrange(len(self._parts))
+            self._shot_block = self._rng.getrandbits(self.INDEX_BITS * self._bulk_shots)
+            self._block_shots = self._bulk_shots
+        self._block_shots -= 1
+        index = self._shot_block & len(self._parts) - 1
+        self._shot_block >>= self.INDEX_BITS
+        return index
+
+    def get_random_unshot_index(self):
+        """ Random cell that has not been shot yet, drawn from a swap-remove pool. None once every cell was shot"""
+        pool = self._unshot
+        if pool is None:
+            pool = self._unshot = [index for index in range(len(self._parts)) if not self._shots >> index & 1]
+        # Cells hit through a Cell view since the pool was built are skipped
+        return draw_unshot(pool, self._rng, self.is_hit)
+
+    def get_cell_at(self, index: int):
+        """ Cell view at index, with no column letter handling"""
+        cell = self._views.get(index)
+        if cell is None:
+            # Cells are only created when asked for
+            cell = Cell(*CELL_COORDINATES[index])
+            cell.bind(self, index)
+            self._views[index] = cell
+        return cell
+
+    def snapshot(self):
+        """ Board state as (shots mask, ship mask)"""
+        return self._shots, self._ship_mask
+
+    def restore(self, snapshot):
+        """
+        Go back to a state taken by snapshot. Restoring shots only is the common case and costs an assignment, a
+        different ship mask must be one of PLACEMENT_MASKS (or 0 for no ship placed) and places a new Ship.
+        """
+        shots, ship_mask = snapshot
+        if ship_mask != self._ship_mask:
+            if ship_mask and ship_mask not in PLACEMENTS_BY_MASK:
+                raise Exception('Ship mask {:#x} is not a legal ship placement'.format(ship_mask))
+            for cell in self._views.values():
+                cell.unbind()
+            self._views = {}
+            self._parts = self.EMPTY_PARTS
+            self._ship_mask = 0
+            self._changed_parts = (1 << len(self._parts)) - 1
+            if ship_mask:
+                self._ship = Ship(placement=PLACEMENTS_BY_MASK[ship_mask])
+                self.place_ship()
+        self.shots = shots
+
+    def render_cell(self, index: int):
+        return CELL_PRINTS[tools.color_enabled][index][self._parts[index]][self._shots >> index & 1] + ' '
 
     def __repr__(self):
-        board_print = ''
-        for row, row_cells in self.cells.items():
-            row_print = ''
-            for cell in row_cells:
-                row_print = '{}{} '.format(row_print, cell)
+        width = len(self.columns)
+        if self._fragments is None or self._rendered_color != tools.color_enabled:
+            self._fragments = [self.render_cell(index) for index in range(len(self._parts))]
+            self._row_prints = [''.join(self._fragments[start:start + width])
+                                for start in range(0, len(self._parts), width)]
+        else:
+            # Only cells shot or replaced since the last render get rendered again, and only their rows joined again
+            changed = (self._shots ^ self._rendered_shots) | self._changed_parts
+            if not changed and self._render is not None:
+                return self._render
+            changed_rows = set()
+            while changed:
+                lowest = changed & -changed
+                index = lowest.bit_length() - 1
+                self._fragments[index] = self.render_cell(index)
+                changed_rows.add(index // width)
+                changed ^= lowest
+            for row in changed_rows:
+                self._row_prints[row] = ''.join(self._fragments[row * width:(row + 1) * width])
+
+        self._rendered_shots = self._shots
+        self._rendered_color = tools.color_enabled
+        self._changed_parts = 0
+        self._render = ''.join('\n{}'.format(row_print) for row_print in self._row_prints)
+        return self._render
+
+    def invalidate_render(self):
+        """ Drop the render cache, for example after a change of the color settings"""
+        self._fragments = None
+        self._render = None
+
+
+# Label of every cell by index, A1 to H8 row by row
+CELL_COORDINATES = tuple((col, row) for row in Board.rows for col in Board.columns)
+CELL_LABELS = tuple('{}{}'.format(col, row) for col, row in CELL_COORDINATES)
+CELL_INDEXES = {label: index for index, label in enumerate(CELL_LABELS)}
+
+# Fleet of the classic game: one ship of 3 cells
+CLASSIC_FLEET = (len(Ship.SHIP_PARTS),)
+
+# Coordinates above, below, before and after every cell, by cell index. None where the board ends
+NEIGHBORS = tuple((cell.default_above(), cell.default_below(), cell.default_before(), cell.default_after())
+                  for cell in (Cell(col, row) for row in Board.rows for col in Board.columns))
+
+# Letter printed for each part code, 'n' when the cell houses no ship part
+PART_LETTERS = {None: 'n', 'Front': 'f', 'Middle': 'm', 'Rear': 'r'}
+
+# Every cell print by color mode, then [cell index][part code][hit], formatted once at import
+CELL_PRINTS = {color: build_cell_prints(CELL_LABELS, [PART_LETTERS[part] for part in Board.PARTS_BY_CODE], color)
+               for color in (True, False)}
+
+
+def build_placement_index():
+    """
+    Every legal ship placement, with the rules of Ship.__init__: vertical ships have their middle on a middle row of
+    any column, horizontal ships on a middle column of any row. Vertical placements come first.
+    :return: list of (placement type, (front, middle, rear) cell indexes)
+    """
+    width = len(Board.columns)
+    placements = []
+    for placement_type in Board.SHIP_PLACEMENTS:
+        if placement_type == Board.VERTICAL:
+            middles = [(col, row) for col in Board.columns for row in Board.middle_rows]
+            step = width
+        else:
+            middles = [(col, row) for col in Board.middle_columns for row in Board.rows]
+            step = 1
+        for col, row in middles:
+            middle = Board.cell_index(col, row)
+            placements.append((placement_type, (middle - step, middle, middle + step)))
+    return placements
+
+
+# Placement table, built once at import. Placements are referred to by their index in these tuples
+PLACEMENT_TYPES = tuple(placement_type for placement_type, cells in build_placement_index())
+PLACEMENT_CELLS = tuple(cells for placement_type, cells in build_placement_index())
+PLACEMENT_MASKS = tuple(sum(1 << cell for cell in cells) for cells in PLACEMENT_CELLS)
+PLACEMENT_IDS = {cells: placement for placement, cells in enumerate(PLACEMENT_CELLS)}
+PLACEMENTS_BY_MASK = {mask: placement for placement, mask in enumerate(PLACEMENT_MASKS)}
+
+# Reverse index: placements covering each cell, as a tuple of placement indexes and as a bit mask of them
+PLACEMENTS_BY_CELL = tuple(
+    tuple(placement for placement, cells in enumerate(PLACEMENT_CELLS) if index in cells)
+    for index in range(len(Board.columns) * len(Board.rows)))
+PLACEMENT_BITS_BY_CELL = tuple(sum(1 << placement for placement in placements) for placements in PLACEMENTS_BY_CELL)
+
+
+class PlacementTracker:
+    """
+    Number of ship placements still consistent with the misses and hits observed so far, for every cell.
+    Placements alive are a bit mask over PLACEMENT_CELLS, a shot only touches the placements it rules out.
+    """
+    def __init__(self):
+        self._alive = (1 << len(PLACEMENT_CELLS)) - 1
+        self._counts = [len(placements) for placements in PLACEMENTS_BY_CELL]
 
-            board_print = '{}\n{}'.format(board_print, row_print)
+    @property
+    def alive(self):
+        return self._alive
 
-        return board_print
+    @property
+    def counts(self):
+        return self._counts
+
+    def copy(self):
+        tracker = PlacementTracker()
+        tracker._alive = self._alive
+        tracker._counts = list(self._counts)
+        return tracker
+
+    def miss(self, index: int):
+        ruled_out = self._alive & PLACEMENT_BITS_BY_CELL[index]
+        self._alive ^= ruled_out
+        self.discount(ruled_out)
+
+    def hit(self, index: int):
+        alive = self._alive & PLACEMENT_BITS_BY_CELL[index]
+        ruled_out = self._alive ^ alive
+        self._alive = alive
+        if bin(ruled_out).count('1') <= bin(alive).count('1'):
+            self.discount(ruled_out)
+            return
+
+        # Fewer placements survive a hit than get ruled out, count the survivors again
+        self.recount(alive)
+
+    def recount(self, alive: int):
+        """ Count the placements of alive from scratch"""
+        self._counts = [0] * len(self._counts)
+        while alive:
+            lowest = alive & -alive
+            for cell in PLACEMENT_CELLS[lowest.bit_length() - 1]:
+                self._counts[cell] += 1
+            alive ^= lowest
+
+    def discount(self, ruled_out: int):
+        while ruled_out:
+            lowest = ruled_out & -ruled_out
+            for cell in PLACEMENT_CELLS[lowest.bit_length() - 1]:
+                self._counts[cell] -= 1
+            ruled_out ^= lowest
 
 
 class Player:
     """ Each player has own board and own ship"""
-    def __init__(self, name=None):
+    __slots__ = ['_name', '_board', '_strategy', '_interactive', '_last_hit_index']
+
+    def __init__(self, name=None, rng=None, strategy=None, bulk_shots: int = 0):
         self._name = name
-        self._board = Board()
-        self._last_hit_cell = None  # Last cell to be hit on player's own board
+        self._board = Board(rng, bulk_shots=bulk_shots)
+        self._strategy = strategy  # Strategy picking the cells this player shoots, random shots when None
+        self._interactive = strategy is not None and strategy.interactive  # Strategy may wait for input
+        self._last_hit_index = None  # Index of the last cell to be hit on player's own board
+
+    @property
+    def last_hit_index(self):
+        return self._last_hit_index
+
+    @last_hit_index.setter
+    def last_hit_index(self, index: int):
+        self._last_hit_index = index
 
     @property
     def last_hit_cell(self):
-        return self._last_hit_cell
+        if self._last_hit_index is None:
+            return None
+        return self.board.get_cell_at(self._last_hit_index)
 
     @last_hit_cell.setter
     def last_hit_cell(self, cell: Cell):
-        self._last_hit_cell = cell
+        self._last_hit_index = None if cell is None else self.board.cell_index(cell.col, cell.row)
 
     @property
     def name(self):
@@ -360,6 +758,20 @@ class Player:
     def board(self, board):
         self._board = board
 
+    @property
+    def strategy(self):
+        return self._strategy
+
+    @strategy.setter
+    def strategy(self, strategy):
+        self._strategy = strategy
+        self._interactive = strategy is not None and strategy.interactive
+
+    @property
+    def interactive(self):
+        """ True when the player's strategy may wait for input, see Game.ready"""
+        return self._interactive
+
     def __repr__(self):
         return self.name
 
@@ -368,16 +780,30 @@ class Player:
 
 
 class Game:
-    def __init__(self, player_1_name: str = 'Player 1', player_2_name:  str = 'Player 2'):
+    def __init__(self, player_1_name: str = 'Player 1', player_2_name:  str = 'Player 2', verbose: bool = True,
+                 rng=None, replacement: bool = True, player_1_strategy=None, player_2_strategy=None, recorder=None,
+                 profiler=None, bulk_shots: int = 0):
+        """
+        :param bulk_shots: random shots with replacement every board draws at once, see Board.draw_random_index. 0
+        draws them one at a time
+        """
         self._round = 0  # Current round
-        self._player_1 = Player(name=player_1_name)
-        self._player_2 = Player(name=player_2_name)
+        self._verbose = verbose  # Print the final board status when the game ends
+        self._replacement = replacement  # Random shots may land on cells already shot when True
+        self._rng = make_rng(rng)  # Source of every random draw of the game, built from a seed if given one
+        self._seed = rng if isinstance(rng, SEED_TYPES) else None
+        self._recorder = recorder  # Gets the ship placements, every shot and the winner, records.RecordWriter
+        self._player_1 = Player(name=player_1_name, rng=self._rng, strategy=player_1_strategy, bulk_shots=bulk_shots)
+        self._player_2 = Player(name=player_2_name, rng=self._rng, strategy=player_2_strategy, bulk_shots=bulk_shots)
         self._is_over = False  # Game is over when one player's ship is sunk
         self._winner = None
         self._loser = None
         self._status = 'Complete' if self.is_over else 'In Progress'
-        self._shoots_first = random.choice([self.player_1, self.player_2])
+        self._shoots_first = self._rng.choice([self.player_1, self.player_2])
         self._shoots_second = self.player_2 if self._shoots_first == self.player_1 else self.player_1
+        self._profiler = profiler  # Times the phases of the game, profiling.GameProfiler
+        if profiler is not None:
+            profiler.attach(self)
 
     @property
     def round(self):
@@ -387,6 +813,35 @@ class Game:
     def round(self, round_value):
         self._round = round_value
 
+    @property
+    def rng(self):
+        return self._rng
+
+    @property
+    def seed(self):
+        """ Seed the game was created with, None when given an rng object or nothing"""
+        return self._seed
+
+    @property
+    def recorder(self):
+        return self._recorder
+
+    @property
+    def replacement(self):
+        return self._replacement
+
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @property
+    def verbose(self):
+        return self._verbose
+
+    @verbose.setter
+    def verbose(self, verbose):
+        self._verbose = verbose
+
     @property
     def player_1(self):
         return self._player_1
@@ -403,6 +858,19 @@ class Game:
     def player_2(self, player_2):
         self._player_2 = player_2
 
+    @property
+    def shoots_first(self):
+        return self._shoots_first
+
+    @shoots_first.setter
+    def shoots_first(self, player: Player):
+        self._shoots_first = player
+        self._shoots_second = self.player_2 if player == self.player_1 else self.player_1
+
+    @property
+    def shoots_second(self):
+        return self._shoots_second
+
     @property
     def is_over(self):
         return self._is_over
@@ -435,51 +903,123 @@ class Game:
     def status(self, status):
         self._status = status
 
+    def ready(self):
+        """ True unless a player's strategy still waits for the input this round needs"""
+        return all(not player.interactive or player.strategy.ready(self.round)
+                   for player in [self.player_1, self.player_2])
+
     def play_round(self):
-        # Round one each player place their ship
+        """
+        Round one each player place their ship, every later round both players shoot once
+        :return: True when the round was played, False when it waits for a player's input
+        """
         if self.is_over:
             raise Exception('Game is already over. Winner: {}'.format(self.winner))
+        # Only interactive strategies may wait for input, games between bots never ask
+        if (self._player_1.interactive or self._player_2.interactive) and not self.ready():
+            return False
 
         if self.round == 0:
-            self._shoots_first.board.place_ship()
-            self._shoots_second.board.place_ship()
+            self.place_ships()
+            if self._recorder is not None:
+                self._recorder.start_game(self)
         else:
-            self.shoot(self._shoots_second)
-            self.shoot(self._shoots_first)
+            self.shoot(self._shoots_second, self.replacement, self._shoots_first.strategy)
+            self.shoot(self._shoots_first, self.replacement, self._shoots_second.strategy)
+            if self._recorder is not None:
+                self._recorder.record_shot(self._shoots_second.last_hit_index)
+                self._recorder.record_shot(self._shoots_first.last_hit_index)
+
+        self.check_winner()
+        self.round += 1
+
+        if self.is_over and self._recorder is not None:
+            self._recorder.end_game(self)
+
+        if self.is_over and self.verbose:
+            print('----------------------------\n')
+            print('Last round board status\n')
+            print('----------------------------')
+            print(self)
+        return True
+
+    def place_ships(self):
+        for player in [self._shoots_first, self._shoots_second]:
+            # Strategies may choose the placement, the random ship of the board is kept otherwise
+            player.board.place_ship(None if player.strategy is None else player.strategy.next_placement())
+
+    @staticmethod
+    def is_sunk(player: Player):
+        return player.board.sunk
 
-        if self.player_1.board.ship.sunk:
+    def check_winner(self):
+        """ Game is over once a ship is sunk, player 1's ship is checked first"""
+        if self.is_sunk(self.player_1):
             self.is_over = True
             self.loser = self.player_1
             self.winner = self.player_2
             self.status = 'Complete'
 
-        elif self.player_2.board.ship.sunk:
+        elif self.is_sunk(self.player_2):
             self.is_over = True
             self.loser = self.player_2
             self.winner = self.player_1
             self.status = 'Complete'
 
-        self.round += 1
-        
-        if self.is_over:
-            print('----------------------------\n')
-            print('Last round board status\n')
-            print('----------------------------')
-            print(self)
-
     @staticmethod
-    def shoot(opponent: Player):
+    def shoot(opponent: Player, replacement: bool = True, strategy=None):
         """
         :param opponent: Player with board getting shot at
+        :param replacement: when False, never shoot the same cell twice
+        :param strategy: shooter's Strategy picking the cell, random shots when None
         :return:
         """
-        random_cell = opponent.board.get_random_cell()
-        random_cell.hit = True
-        opponent.last_hit_cell = random_cell
-        opponent.board.ship.sink()
+        board = opponent.board
+        if strategy is not None:
+            index = strategy.next_shot(board)
+        elif replacement:
+            index = board.draw_random_index()
+        else:
+            index = board.get_random_unshot_index()
+        opponent.last_hit_index = index
+        hit = board.shoot(index)
+        sunk = hit and board.sunk
+        if sunk:
+            board.ship.sunk = True
+        if strategy is not None:
+            strategy.observe(index, hit, sunk)
+
+    def snapshot(self):
+        """
+        Game state as a flat tuple of ints: round, shots and ship masks of both boards, last cell hit on both boards,
+        first shooter and winner (1 or 2, 0 while in progress). Strategies keep their own state and are not included.
+        """
+        return (self.round,
+                self.player_1.board.shots, self.player_1.board.ship_mask,
+                self.player_2.board.shots, self.player_2.board.ship_mask,
+                self.player_1.last_hit_index, self.player_2.last_hit_index,
+                1 if self._shoots_first is self.player_1 else 2,
+                0 if self.winner is None else 1 if self.winner is self.player_1 else 2)
+
+    def restore(self, snapshot):
+        """ Go back to a state taken by snapshot"""
+        round_value, shots_1, ship_1, shots_2, ship_2, last_hit_1, last_hit_2, first_shooter, winner = snapshot
+        players = [self.player_1, self.player_2]
+        self.round = round_value
+        self.player_1.board.restore((shots_1, ship_1))
+        self.player_2.board.restore((shots_2, ship_2))
+        self.player_1.last_hit_index = last_hit_1
+        self.player_2.last_hit_index = last_hit_2
+        self.shoots_first = players[first_shooter - 1]
+        self.is_over = bool(winner)
+        self.winner = players[winner - 1] if winner else None
+        self.loser = players[2 - winner] if winner else None
+        self.status = 'Complete' if winner else 'In Progress'
 
     def __repr__(self):
+        return self.render()
 
+    def render(self):
         title = '\n{} vs {}: Round {}, {}, Winner: {}'.format(self._shoots_first, self._shoots_second, self.round, self.status, self.winner)
         l1 = '---------------------------------------------------------------------------------------------------'
         l2 = '==================================================================================================='
@@ -514,10 +1054,26 @@ if __name__ == '__main__':
 
 
 
-    new_game = Game(player_1_name, player_2_name)
+    # Player 1 types placement and shots when the game is started with --play
+    human = None
+    if '--play' in sys.argv:
+        from strategies import InputStrategy
+        human = InputStrategy()
+
+    new_game = Game(player_1_name, player_2_name, player_1_strategy=human)
 
     while not new_game.is_over:
-        new_game.play_round()
+        if new_game.play_round():
+            if human is not None and new_game.round > 1:
+                shot = new_game.player_2.last_hit_index
+                print('{}: {}'.format(CELL_LABELS[shot],
+                                      'hit' if new_game.player_2.board.ship_mask >> shot & 1 else 'miss'))
+            continue
+        prompt = 'Place your ship, front cell and V or H (B4 V): ' if new_game.round == 0 else 'Fire at: '
+        try:
+            human.feed(input(prompt))
+        except Exception as error:
+            print(error)
 
     print ('You sunk my battleship')
 
@@ -0,0 +1,202 @@
+import random
+from array import array
+
+from battleship import CLASSIC_FLEET
+from simulation import PLAYER_1, PLAYER_2, SimulationResult
+from strategies import make_strategy
+from tools import draw_unshot, make_rng
+
+# Random positions tried for a ship before falling back to enumerating every free position
+PLACEMENT_ATTEMPTS = 32
+
+
+def column_label(col: int):
+    """ Column letters for a 0 based column: A to Z, then AA, AB and so on"""
+    label = ''
+    col += 1
+    while col:
+        col, rest = divmod(col - 1, 26)
+        label = chr(ord('A') + rest) + label
+    return label
+
+
+class FleetBoard:
+    """
+    Board of any width and height housing a fleet of ships of any lengths, ships do not overlap.
+    State lives in flat arrays indexed row * width + col, no Cell object is ever created, so a 1000x1000 board
+    costs a few MB. Offers the same shooting API as Board, so strategies can fire at either.
+    """
+    def __init__(self, width: int = 8, height: int = 8, fleet=CLASSIC_FLEET, rng=None):
+        """
+        :param width: number of columns
+        :param height: number of rows
+        :param fleet: length of every ship of the fleet
+        :param rng: random.Random instance or seed used for placement and random shots, the random module by default
+        """
+        if width < 1 or height < 1:
+            raise Exception('Board of {}x{} must have at least one column and one row'.format(width, height))
+        if not fleet or min(fleet) < 1 or max(fleet) > max(width, height):
+            raise Exception('Ship lengths {} must fit on a {}x{} board'.format(list(fleet), width, height))
+        self._width = width
+        self._height = height
+        self._rng = make_rng(rng)
+        self._owner = array('I', bytes(4 * width * height))  # Ship number + 1 for every cell, 0 for water
+        self._shot = bytearray(width * height)  # 1 for every cell shot
+        self._ships = []  # Cell indexes of every ship
+        self._remaining = []  # Parts of every ship not hit yet
+        self._afloat = 0  # Ships not sunk yet
+        self._unshot = None  # Pool of cells not shot yet, built on the first draw without replacement
+
+        # Longest ships first, while the board is emptiest
+        for length in sorted(fleet, reverse=True):
+            self.add_ship(self.find_free_position(length))
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def rng(self):
+        return self._rng
+
+    @property
+    def ships(self):
+        return self._ships
+
+    @property
+    def afloat(self):
+        return self._afloat
+
+    @property
+    def sunk(self):
+        """ True once every ship of the fleet is sunk"""
+        return self._afloat == 0
+
+    def cell_label(self, index: int):
+        row, col = divmod(index, self._width)
+        return '{}{}'.format(column_label(col), row + 1)
+
+    def is_free(self, start: int, step: int, length: int):
+        owner = self._owner
+        return all(not owner[start + offset * step] for offset in range(length))
+
+    def find_free_position(self, length: int):
+        """
+        Random free position for a ship. A few random tries are enough on a sparse board, otherwise every free
+        position is listed and one is drawn, so a crowded board never loops forever.
+        :return: cell indexes of the ship
+        """
+        rng = self._rng
+        width, height = self._width, self._height
+        orientations = []
+        if length <= width:
+            orientations.append((1, width - length + 1, height))
+        if length <= height:
+            orientations.append((width, width, height - length + 1))
+
+        for _ in range(PLACEMENT_ATTEMPTS):
+            step, cols, rows = rng.choice(orientations)
+            start = rng.randrange(rows) * width + rng.randrange(cols)
+            if self.is_free(start, step, length):
+                return tuple(range(start, start + step * length, step))
+
+        positions = [(row * width + col, step)
+                     for step, cols, rows in orientations
+                     for row in range(rows) for col in range(cols)
+                     if self.is_free(row * width + col, step, length)]
+        if not positions:
+            raise Exception('No free position left for a ship of length {}'.format(length))
+        start, step = rng.choice(positions)
+        return tuple(range(start, start + step * length, step))
+
+    def add_ship(self, cells):
+        ship_number = len(self._ships) + 1
+        for index in cells:
+            self._owner[index] = ship_number
+        self._ships.append(cells)
+        self._remaining.append(len(cells))
+        self._afloat += 1
+
+    def get_random_index(self, rng=None):
+        return (self._rng if rng is None else rng).randrange(self._width * self._height)
+
+    def get_random_unshot_index(self):
+        """ Random cell that has not been shot yet, drawn from a swap-remove pool. None once every cell was shot"""
+        pool = self._unshot
+        if pool is None:
+            pool = self._unshot = array('I', (index for index in range(len(self._shot)) if not self._shot[index]))
+        return draw_unshot(pool, self._rng, self.is_hit)
+
+    def is_hit(self, index: int):
+        return bool(self._shot[index])
+
+    def shoot(self, index: int):
+        """ Mark the cell at index as hit, return True when it houses a ship part"""
+        ship_number = self._owner[index]
+        if not self._shot[index]:
+            self._shot[index] = 1
+            if ship_number:
+                self._remaining[ship_number - 1] -= 1
+                if not self._remaining[ship_number - 1]:
+                    self._afloat -= 1
+        return bool(ship_number)
+
+    def is_ship_sunk(self, index: int):
+        """ True when the cell at index houses a part of a ship that is sunk"""
+        ship_number = self._owner[index]
+        return bool(ship_number) and not self._remaining[ship_number - 1]
+
+
+def play_fleet_game(width: int = 8, height: int = 8, fleet=CLASSIC_FLEET, rng=None, replacement: bool = True,
+                    player_1_strategy=None, player_2_strategy=None):
+    """
+    Play one game on two FleetBoards with the rules of Game.play_round: a random first shooter, both players fire
+    once per round, and player 1's fleet is checked first when both fleets sink in the same round.
+    :param player_1_strategy: Strategy or strategy name player 1 shoots with, random shots when None
+    :param player_2_strategy: Strategy or strategy name player 2 shoots with
+    :return: (winner, first shooter, rounds played), players as simulation.PLAYER_1 / PLAYER_2
+    """
+    rng = make_rng(rng)
+    boards = {PLAYER_1: FleetBoard(width, height, fleet, rng), PLAYER_2: FleetBoard(width, height, fleet, rng)}
+    strategies = {player: make_strategy(strategy, width=width, height=height, fleet=fleet) if strategy else None
+                  for player, strategy in [(PLAYER_1, player_1_strategy), (PLAYER_2, player_2_strategy)]}
+    first_shooter = rng.choice([PLAYER_1, PLAYER_2])
+    second_shooter = PLAYER_2 if first_shooter == PLAYER_1 else PLAYER_1
+
+    rounds = 0
+    while True:
+        rounds += 1
+        for shooter, opponent in [(first_shooter, second_shooter), (second_shooter, first_shooter)]:
+            board = boards[opponent]
+            strategy = strategies[shooter]
+            if strategy is not None:
+                index = strategy.next_shot(board)
+            elif replacement:
+                index = board.get_random_index()
+            else:
+                index = board.get_random_unshot_index()
+            hit = board.shoot(index)
+            if strategy is not None:
+                strategy.observe(index, hit, hit and board.is_ship_sunk(index))
+
+        if boards[PLAYER_1].sunk:
+            return PLAYER_2, first_shooter, rounds
+        if boards[PLAYER_2].sunk:
+            return PLAYER_1, first_shooter, rounds
+
+
+def simulate_fleet(n_games: int, width: int = 8, height: int = 8, fleet=CLASSIC_FLEET, seed=None,
+                   replacement: bool = True, player_1_strategy: str = None, player_2_strategy: str = None):
+    """
+    Play games on boards of any size and fleet, see play_fleet_game
+    :return: SimulationResult
+    """
+    rng = random.Random(seed)
+    result = SimulationResult()
+    for _ in range(n_games):
+        result.add_game(*play_fleet_game(width, height, fleet, rng, replacement, player_1_strategy, player_2_strategy))
+    return result
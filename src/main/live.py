@@ -0,0 +1,126 @@
+import sys
+import time
+
+from battleship import Board, Game
+from tools import Colors, Cursor, move_cursor
+
+# Screen columns taken by one cell, for example 'A1[no] '
+CELL_WIDTH = 7
+
+# Screen line of the title, then of each board name, boards rows follow their name
+TITLE_LINE = 1
+BOARD_LINES = [3, 4 + len(Board.rows) + 1]
+HITS_LINE = BOARD_LINES[-1] + len(Board.rows) + 2
+
+
+class LiveView:
+    """
+    Live terminal view of a game. The first frame draws both boards, later frames only move the cursor to the cells
+    that changed since the previous frame and redraw those. Frames closer than 1 / fps apart are skipped, the changes
+    they would have drawn are picked up by the next frame.
+    """
+    def __init__(self, game: Game, stream=None, fps: float = 30, clock=time.monotonic):
+        self._game = game
+        self._stream = sys.stdout if stream is None else stream
+        self._frame_interval = 1.0 / fps if fps else 0.0
+        self._clock = clock
+        self._last_frame = None  # Time of the last frame drawn
+        self._drawn = None  # (shots, ship mask) of each board as drawn on screen
+        self._frames = 0
+
+    @property
+    def frames(self):
+        return self._frames
+
+    def boards(self):
+        """ Boards in the order Game.__repr__ prints them"""
+        return [self._game.shoots_first.board, self._game.shoots_second.board]
+
+    def title(self):
+        game = self._game
+        return '{} vs {}: Round {}, {}, Winner: {}'.format(
+            game.shoots_first, game.shoots_second, game.round, game.status, game.winner)
+
+    def hits(self):
+        game = self._game
+        return '{} hit {}  {} hit {}'.format(
+            game.shoots_first.name, game.shoots_second.last_hit_cell,
+            game.shoots_second.name, game.shoots_first.last_hit_cell)
+
+    @staticmethod
+    def cell_position(board_line: int, index: int):
+        row, col = divmod(index, len(Board.columns))
+        return board_line + 1 + row, 1 + col * CELL_WIDTH
+
+    def full_frame(self):
+        parts = [Cursor.hide, Cursor.clear_screen, move_cursor(TITLE_LINE, 1), self.title()]
+        for board_line, player, board in zip(BOARD_LINES, [self._game.shoots_first, self._game.shoots_second],
+                                             self.boards()):
+            parts.append(move_cursor(board_line, 1))
+            parts.append('{}\'s Board'.format(player.name))
+            # The board print starts with a new line, each of its rows goes on its own screen line
+            for row, row_print in enumerate(str(board).split('\n')[1:]):
+                parts.append(move_cursor(board_line + 1 + row, 1))
+                parts.append(row_print)
+        return parts
+
+    def diff_frame(self):
+        parts = [move_cursor(TITLE_LINE, 1), Cursor.clear_line, self.title()]
+        for board_line, board, (shots, ship_mask) in zip(BOARD_LINES, self.boards(), self._drawn):
+            changed = (board.shots ^ shots) | (board.ship_mask ^ ship_mask)
+            while changed:
+                lowest = changed & -changed
+                index = lowest.bit_length() - 1
+                parts.append(move_cursor(*self.cell_position(board_line, index)))
+                parts.append(board.render_cell(index))
+                changed ^= lowest
+        return parts
+
+    def update(self, force: bool = False):
+        """
+        Draw a frame, unless the previous one is too recent
+        :param force: draw even within the frame interval, for the last frame of a game
+        :return: True when a frame was drawn
+        """
+        now = self._clock()
+        if not force and self._last_frame is not None and now - self._last_frame < self._frame_interval:
+            return False
+
+        parts = self.full_frame() if self._drawn is None else self.diff_frame()
+        parts.extend([move_cursor(HITS_LINE, 1), Cursor.clear_line, self.hits(), Colors.reset,
+                      move_cursor(HITS_LINE + 1, 1)])
+        self._stream.write(''.join(parts))
+        self._stream.flush()
+
+        self._drawn = [(board.shots, board.ship_mask) for board in self.boards()]
+        self._last_frame = now
+        self._frames += 1
+        return True
+
+    def close(self):
+        self._stream.write(Cursor.show)
+        self._stream.flush()
+
+
+def watch(game: Game, stream=None, fps: float = 30, round_delay: float = 0.0):
+    """
+    Play a game to the end while drawing it live
+    :param round_delay: seconds to wait after each round, 0 to play at full speed
+    """
+    game.verbose = False
+    view = LiveView(game, stream, fps)
+    try:
+        view.update(force=True)
+        while not game.is_over:
+            game.play_round()
+            view.update(force=game.is_over)
+            if round_delay:
+                time.sleep(round_delay)
+    finally:
+        view.close()
+    return view
+
+
+if __name__ == '__main__':
+    # python live.py [seconds between rounds]
+    watch(Game(), round_delay=float(sys.argv[1]) if len(sys.argv) > 1 else 0.05)
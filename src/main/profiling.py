@@ -0,0 +1,91 @@
+import json
+import marshal
+import time
+from functools import wraps
+
+# Game phases timed by GameProfiler, with the Game method behind each
+PHASES = {
+    'placement': 'place_ships',
+    'shoot': 'shoot',
+    'sink': 'is_sunk',
+    'win_check': 'check_winner',
+    'render': 'render',
+}
+
+
+class GameProfiler:
+    """
+    Call counts and time spent in every phase of the games it is attached to, with Game(profiler=...).
+    Attaching replaces the phase methods of that Game instance with timed wrappers, a game without a profiler runs
+    the plain methods and pays nothing. One profiler may be shared by many games, its counters add up.
+    """
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._calls = dict.fromkeys(PHASES, 0)
+        self._seconds = dict.fromkeys(PHASES, 0.0)
+        self._functions = {}  # Function behind every phase, for cProfile-compatible dumps
+
+    @property
+    def calls(self):
+        return self._calls
+
+    @property
+    def seconds(self):
+        return self._seconds
+
+    def reset(self):
+        self._calls = dict.fromkeys(PHASES, 0)
+        self._seconds = dict.fromkeys(PHASES, 0.0)
+
+    def wrap(self, phase: str, function):
+        """ Timed version of function, counted under phase"""
+        if phase not in PHASES:
+            raise Exception('Phase {} must be in allowed phases list {}'.format(phase, list(PHASES)))
+        self._functions[phase] = getattr(function, '__func__', function)
+        clock = self._clock
+
+        @wraps(function)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                # Counters are looked up on every call, so wrappers made before a reset() see the new ones
+                self._seconds[phase] += clock() - start
+                self._calls[phase] += 1
+
+        return timed
+
+    def attach(self, game):
+        """ Time the phases of game from now on"""
+        for phase, method in PHASES.items():
+            setattr(game, method, self.wrap(phase, getattr(game, method)))
+
+    def stats(self):
+        """ {phase: {'calls', 'seconds', 'mean_us'}}"""
+        return {phase: {'calls': self._calls[phase], 'seconds': self._seconds[phase],
+                        'mean_us': self._seconds[phase] / self._calls[phase] * 1e6 if self._calls[phase] else 0.0}
+                for phase in PHASES}
+
+    def to_json(self, path: str = None):
+        """ Stats as a JSON string, also written to path when given one"""
+        dump = json.dumps(self.stats(), indent=2)
+        if path is not None:
+            with open(path, 'w') as json_file:
+                json_file.write(dump)
+        return dump
+
+    def dump_stats(self, path: str):
+        """ Write the stats in the format of cProfile.Profile.dump_stats, readable with pstats.Stats(path)"""
+        entries = {}
+        for phase, function in self._functions.items():
+            code = getattr(function, '__code__', None)
+            key = (code.co_filename, code.co_firstlineno, function.__name__) if code else ('~', 0, phase)
+            calls = self._calls[phase]
+            entries[key] = (calls, calls, self._seconds[phase], self._seconds[phase], {})
+        with open(path, 'wb') as stats_file:
+            marshal.dump(entries, stats_file)
+
+    def __repr__(self):
+        return '\n'.join('{:<10} {:10d} calls {:12.6f} s {:10.3f} us/call'.format(
+            phase, values['calls'], values['seconds'], values['mean_us']) for phase, values in self.stats().items())
@@ -0,0 +1,183 @@
+import mmap
+import struct
+
+from battleship import Game
+
+# Record layout, little endian:
+#   magic 'BS', flags (bit 0: seed known), seed (uint64), first shooter (1 or 2), placement of player 1's and
+#   player 2's ship (index in battleship.PLACEMENT_CELLS), name of player 1 and 2 (1 byte length + UTF-8),
+#   then one byte per shot (cell index, the first shooter's shot first in every round),
+#   then END_OF_SHOTS and the winner (1 or 2).
+MAGIC = b'BS'
+HEADER = struct.Struct('<2sBQBBB')
+SEED_KNOWN = 0b1
+END_OF_SHOTS = 0xFF
+SEED_MASK = (1 << 64) - 1
+
+
+class GameRecord:
+    """ One recorded game. Shots are a bytes object of cell indexes, in the order they were fired"""
+    def __init__(self, seed, first_shooter: int, placements, names, shots: bytes, winner: int):
+        self._seed = seed
+        self._first_shooter = first_shooter
+        self._placements = placements
+        self._names = names
+        self._shots = shots
+        self._winner = winner
+
+    @property
+    def seed(self):
+        return self._seed
+
+    @property
+    def first_shooter(self):
+        """ 1 when player 1 shot first, 2 otherwise"""
+        return self._first_shooter
+
+    @property
+    def placements(self):
+        """ (player 1's ship placement, player 2's ship placement)"""
+        return self._placements
+
+    @property
+    def names(self):
+        return self._names
+
+    @property
+    def shots(self):
+        return self._shots
+
+    @property
+    def winner(self):
+        return self._winner
+
+    @property
+    def rounds(self):
+        """ Shooting rounds played"""
+        return len(self._shots) // 2
+
+    def __repr__(self):
+        return 'GameRecord(seed={}, names={}, placements={}, rounds={}, winner={})'.format(
+            self.seed, self.names, self.placements, self.rounds, self.winner)
+
+
+def player_number(game: Game, player):
+    return 1 if player is game.player_1 else 2
+
+
+def encode_seed(seed):
+    """
+    (flags, seed field) of the header for a seed. Seeds the field cannot hold as they are, like negative, wider than
+    64 bits or not int, are recorded as unknown: replays only need the placements and shots
+    """
+    if not isinstance(seed, int) or not 0 <= seed <= SEED_MASK:
+        return 0, 0
+    return SEED_KNOWN, seed
+
+
+def encode_name(name):
+    encoded = str(name).encode('utf-8')
+    if len(encoded) > 255:
+        raise Exception('Player name {} must fit in 255 bytes once encoded'.format(name))
+    return bytes([len(encoded)]) + encoded
+
+
+class RecordWriter:
+    """
+    Append-only writer of game records, hooked into a game with Game(recorder=writer).
+    A record is built while its game is played and appended to the file once the game is over, so a file never
+    holds half a game. Plays one game at a time.
+    """
+    def __init__(self, path):
+        self._file = open(path, 'ab')
+        self._record = None  # Record of the game being played
+        self._games = 0
+
+    @property
+    def games(self):
+        return self._games
+
+    def start_game(self, game: Game):
+        """ Called once ships are placed"""
+        flags, seed = encode_seed(game.seed)
+        placements = [game.player_1.board.placement, game.player_2.board.placement]
+        if None in placements:
+            raise Exception('Ships of both players must be placed before recording, placements are {}'.format(
+                placements))
+        self._record = bytearray(HEADER.pack(
+            MAGIC, flags, seed, player_number(game, game.shoots_first), *placements))
+        self._record += encode_name(game.player_1.name)
+        self._record += encode_name(game.player_2.name)
+
+    def record_shot(self, index: int):
+        self._record.append(index)
+
+    def end_game(self, game: Game):
+        self._record.append(END_OF_SHOTS)
+        self._record.append(player_number(game, game.winner))
+        self._file.write(self._record)
+        self._record = None
+        self._games += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def parse_record(data, offset: int):
+    """
+    :param data: buffer holding records, bytes or mmap
+    :param offset: position of the record in data
+    :return: (GameRecord, offset of the next record), or (None, offset) when no complete record starts there
+    """
+    if offset + HEADER.size > len(data):
+        return None, offset
+    magic, flags, seed, first_shooter, placement_1, placement_2 = HEADER.unpack_from(data, offset)
+    if magic != MAGIC:
+        raise Exception('No game record at offset {}'.format(offset))
+
+    position = offset + HEADER.size
+    names = []
+    for _ in range(2):
+        if position >= len(data) or position + 1 + data[position] > len(data):
+            return None, offset
+        length = data[position]
+        names.append(bytes(data[position + 1:position + 1 + length]).decode('utf-8'))
+        position += 1 + length
+
+    end = data.find(bytes([END_OF_SHOTS]), position)
+    if end < 0 or end + 1 >= len(data):
+        return None, offset
+
+    record = GameRecord(seed if flags & SEED_KNOWN else None, first_shooter, (placement_1, placement_2),
+                        tuple(names), bytes(data[position:end]), data[end + 1])
+    return record, end + 2
+
+
+def read_records(path):
+    """
+    Iterate over the records of a file without loading it: the file is memory mapped and records are parsed one at a
+    time. An incomplete record at the end of the file is ignored.
+    """
+    with open(path, 'rb') as records_file:
+        try:
+            data = mmap.mmap(records_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file, nothing to map
+            return
+        try:
+            offset = 0
+            while True:
+                record, offset = parse_record(data, offset)
+                if record is None:
+                    return
+                yield record
+        finally:
+            data.close()
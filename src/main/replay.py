@@ -0,0 +1,103 @@
+import random
+
+from battleship import PLACEMENT_MASKS, Game
+from records import GameRecord
+
+# Rounds between two snapshots of the boards
+DEFAULT_SNAPSHOT_INTERVAL = 16
+
+
+class Replay:
+    """
+    Rebuild the state of a recorded game at any round from its ship placements and shots, with no random draw.
+    Shots masks of both boards are snapshot every few rounds, so jumping to a round replays at most one interval.
+    Round k is the state after k shooting rounds, when Game.round is k + 1.
+    """
+    def __init__(self, record: GameRecord, snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL):
+        if snapshot_interval < 1:
+            raise Exception('Snapshot interval {} must be at least 1'.format(snapshot_interval))
+        self._record = record
+        self._interval = snapshot_interval
+        self._snapshots = self.take_snapshots()
+
+    @property
+    def record(self):
+        return self._record
+
+    @property
+    def rounds(self):
+        return self._record.rounds
+
+    @property
+    def snapshots(self):
+        return self._snapshots
+
+    def targets(self):
+        """ Player numbers of the boards shot by the first and by the second shooter"""
+        first_shooter = self._record.first_shooter
+        return 3 - first_shooter, first_shooter
+
+    def take_snapshots(self):
+        """ Shots masks of player 1's and player 2's boards at rounds 0, interval, 2 * interval..."""
+        shots = self._record.shots
+        first_target, second_target = self.targets()
+        masks = {1: 0, 2: 0}
+        snapshots = [(0, 0)]
+        for round_index in range(self.rounds):
+            masks[first_target] |= 1 << shots[2 * round_index]
+            masks[second_target] |= 1 << shots[2 * round_index + 1]
+            if (round_index + 1) % self._interval == 0:
+                snapshots.append((masks[1], masks[2]))
+        return snapshots
+
+    def shots_at(self, round_number: int):
+        """ Shots masks of player 1's and player 2's boards after round_number shooting rounds"""
+        if not 0 <= round_number <= self.rounds:
+            raise Exception('Round {} must be between 0 and {}'.format(round_number, self.rounds))
+        snapshot = round_number // self._interval
+        masks = dict(zip([1, 2], self._snapshots[snapshot]))
+        shots = self._record.shots
+        first_target, second_target = self.targets()
+        for round_index in range(snapshot * self._interval, round_number):
+            masks[first_target] |= 1 << shots[2 * round_index]
+            masks[second_target] |= 1 << shots[2 * round_index + 1]
+        return masks[1], masks[2]
+
+    def state_at(self, round_number: int):
+        """
+        :param round_number: shooting rounds played, 0 right after ship placement
+        :return: Game as it was after round_number shooting rounds
+        """
+        record = self._record
+        shots_1, shots_2 = self.shots_at(round_number)
+        last_hits = {1: None, 2: None}
+        if round_number:
+            first_target, second_target = self.targets()
+            last_hits[first_target] = record.shots[2 * (round_number - 1)]
+            last_hits[second_target] = record.shots[2 * (round_number - 1) + 1]
+        winner = record.winner if round_number == self.rounds else 0
+
+        # Placement and first shooter drawn here are overwritten by restore, a private generator keeps those draws
+        # away from the random module, which unseeded games share
+        game = Game(*record.names, verbose=False, rng=random.Random(0))
+        game.restore((round_number + 1,
+                      shots_1, PLACEMENT_MASKS[record.placements[0]],
+                      shots_2, PLACEMENT_MASKS[record.placements[1]],
+                      last_hits[1], last_hits[2], record.first_shooter, winner))
+        return game
+
+    def bisect(self, predicate):
+        """
+        First round at which predicate(game) holds, assuming it keeps holding afterwards
+        :return: round number, None when it never holds
+        """
+        low, high = 0, self.rounds
+        if not predicate(self.state_at(high)):
+            return None
+        while low < high:
+            middle = (low + high) // 2
+            if predicate(self.state_at(middle)):
+                high = middle
+            else:
+                low = middle + 1
+        return low
@@ -0,0 +1,150 @@
+import asyncio
+import sys
+
+from battleship import CELL_LABELS, PLACEMENT_MASKS, Board, Game
+from strategies import InputStrategy
+
+# Line protocol, one reply line per command line:
+#   PLACE <front cell> <V|H>  ->  PLACED                          start a game, bot ship placed at random
+#   FIRE <cell>               ->  SHOT <cell> <HIT|MISS> <bot cell> <HIT|MISS> <ONGOING|WIN|LOSE>
+#   QUIT                      ->  BYE
+# Anything else gets ERROR <reason>. Cells are labels like B4, a vertical ship runs down from its front cell, a
+# horizontal one to the right.
+OUTCOMES = ['ONGOING', 'WIN', 'LOSE']
+
+# Longest command line accepted
+MAX_LINE = 64
+
+
+class Session:
+    """ One connection's game, kept as a Game.snapshot() tuple between commands. None before the first PLACE"""
+    __slots__ = ['state']
+
+    def __init__(self):
+        self.state = None
+
+
+class GameServer:
+    """
+    Host many concurrent games of a client (player 1) against a random bot (player 2), shooting without replacement.
+    Sessions only keep the flat snapshot of their game. A command restores it into a single scratch Game, plays it
+    and snapshots the result, with no await in between, so one Game object serves every session.
+    """
+    def __init__(self, rng=None):
+        self._game = Game('Client', 'Bot', verbose=False, rng=rng, replacement=False)
+        self._input = InputStrategy()
+        self._game.player_1.strategy = self._input
+        self._sessions = 0
+        self._games = 0
+
+    @property
+    def sessions(self):
+        """ Connections currently open"""
+        return self._sessions
+
+    @property
+    def games(self):
+        """ Games started so far"""
+        return self._games
+
+    def new_game(self, placement: int):
+        """ Snapshot of a fresh game with the client's ship on placement and the bot's one at random"""
+        game = self._game
+        rng = game.rng
+        first_shooter = rng.choice([1, 2])
+        self._games += 1
+        return (1, 0, PLACEMENT_MASKS[placement], 0, PLACEMENT_MASKS[rng.randrange(len(PLACEMENT_MASKS))],
+                None, None, first_shooter, 0)
+
+    def fire(self, state, label: str):
+        """
+        Play one round of the game in state, the client firing at the cell with label
+        :return: (new state, client's shot index, bot's shot index)
+        """
+        game = self._game
+        game.restore(state)
+        self._input.fire(label)
+        game.play_round()
+        return game.snapshot(), game.player_2.last_hit_index, game.player_1.last_hit_index
+
+    def command(self, session: Session, line: str):
+        """ Run one command line of session, return the reply line"""
+        words = line.split()
+        if not words:
+            return 'ERROR empty command'
+        verb = words[0].upper()
+
+        if verb == 'PLACE':
+            if len(words) != 3:
+                return 'ERROR usage: PLACE <front cell> <V|H>'
+            if session.state is not None and not session.state[-1]:
+                return 'ERROR game in progress'
+            try:
+                placement = Board.parse_placement(words[1], words[2])
+            except Exception as error:
+                return 'ERROR {}'.format(error)
+            session.state = self.new_game(placement)
+            return 'PLACED'
+
+        if verb == 'FIRE':
+            if len(words) != 2:
+                return 'ERROR usage: FIRE <cell>'
+            if session.state is None:
+                return 'ERROR no ship placed'
+            if session.state[-1]:
+                return 'ERROR game over'
+            try:
+                state, index, bot_index = self.fire(session.state, words[1])
+            except Exception as error:
+                return 'ERROR {}'.format(error)
+            session.state = state
+            _, _, ship_1, shots_2, ship_2, _, _, _, winner = state
+            return 'SHOT {} {} {} {} {}'.format(
+                CELL_LABELS[index], 'HIT' if ship_2 >> index & 1 else 'MISS',
+                CELL_LABELS[bot_index], 'HIT' if ship_1 >> bot_index & 1 else 'MISS', OUTCOMES[winner])
+
+        if verb == 'QUIT':
+            return 'BYE'
+
+        return 'ERROR unknown command {}'.format(verb)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """ Serve one connection until QUIT or disconnection"""
+        session = Session()
+        self._sessions += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    return
+                reply = self.command(session, line.decode('utf-8', 'replace'))
+                writer.write(reply.encode('utf-8') + b'\n')
+                await writer.drain()
+                if reply == 'BYE':
+                    return
+        except ConnectionError:
+            return
+        finally:
+            self._sessions -= 1
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0, path: str = None):
+        """
+        Start listening, over TCP, or over a Unix socket when given a path
+        :return: asyncio Server
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path=path, limit=MAX_LINE)
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+
+
+async def serve(host: str = '127.0.0.1', port: int = 7777, path: str = None, rng=None):
+    server = await GameServer(rng).start(host, port, path)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    # python server.py [port], then for example: nc localhost 7777 and PLACE B4 V, FIRE C5...
+    asyncio.run(serve(port=int(sys.argv[1]) if len(sys.argv) > 1 else 7777))
@@ -0,0 +1,186 @@
+import random
+from collections import Counter
+
+from battleship import Board, Game
+from strategies import make_strategy
+
+# Number of cells on the board, cells are indexed row * 8 + col starting at A1
+CELL_COUNT = len(Board.columns) * len(Board.rows)
+
+PLAYER_1 = 'player_1'
+PLAYER_2 = 'player_2'
+
+
+class SimulationResult:
+    """ Aggregate outcome of a batch of headless games"""
+    def __init__(self):
+        self._games = 0
+        self._wins = Counter()  # Games won, keyed by PLAYER_1 / PLAYER_2
+        self._first_shooter_wins = 0  # Games won by the player who shot first
+        self._rounds = Counter()  # Shooting rounds played until a ship sank -> number of games
+
+    @property
+    def games(self):
+        return self._games
+
+    @property
+    def wins(self):
+        return self._wins
+
+    @property
+    def first_shooter_wins(self):
+        return self._first_shooter_wins
+
+    @property
+    def rounds(self):
+        return self._rounds
+
+    @property
+    def first_shooter_win_rate(self):
+        return self.first_shooter_wins / self.games if self.games else 0.0
+
+    @property
+    def first_shooter_advantage(self):
+        """ How much more often the first shooter wins than a fair coin would"""
+        return self.first_shooter_win_rate - 0.5 if self.games else 0.0
+
+    @property
+    def mean_rounds(self):
+        if not self.games:
+            return 0.0
+        return sum(rounds * count for rounds, count in self.rounds.items()) / self.games
+
+    def add_game(self, winner: str, first_shooter: str, rounds: int):
+        self._games += 1
+        self._wins[winner] += 1
+        if winner == first_shooter:
+            self._first_shooter_wins += 1
+        self._rounds[rounds] += 1
+
+    def add_games(self, rounds: int, player_1_wins: int, player_2_wins: int, first_shooter_wins: int):
+        """ Record a group of games that all ended after the same number of rounds"""
+        games = player_1_wins + player_2_wins
+        if not games:
+            return
+        self._games += games
+        self._wins[PLAYER_1] += player_1_wins
+        self._wins[PLAYER_2] += player_2_wins
+        self._first_shooter_wins += first_shooter_wins
+        self._rounds[rounds] += games
+
+    def merge(self, other):
+        """ Fold the results of another batch into this one"""
+        self._games += other.games
+        self._wins.update(other.wins)
+        self._first_shooter_wins += other.first_shooter_wins
+        self._rounds.update(other.rounds)
+        return self
+
+    def __repr__(self):
+        return 'SimulationResult(games={}, wins={}, first_shooter_win_rate={:.4f}, mean_rounds={:.2f})'.format(
+            self.games, dict(self.wins), self.first_shooter_win_rate, self.mean_rounds)
+
+
+def random_ship_mask(rng):
+    """
+    Draw a ship placement with the same rules as Ship.__init__, without building any Cell
+    :param rng: random.Random instance
+    :return: bit mask of the 3 cells covered by the ship
+    """
+    if rng.choice(Board.SHIP_PLACEMENTS) == Board.VERTICAL:
+        col = rng.randrange(len(Board.columns))
+        row = rng.randrange(1, len(Board.rows) - 1)
+        middle = row * len(Board.columns) + col
+        return (1 << middle - len(Board.columns)) | (1 << middle) | (1 << middle + len(Board.columns))
+
+    col = rng.randrange(1, len(Board.columns) - 1)
+    row = rng.randrange(len(Board.rows))
+    middle = row * len(Board.columns) + col
+    return (0b111 << middle - 1)
+
+
+def simulate(n_games: int, seed=None, replacement: bool = True):
+    """
+    Play games end-to-end with no printing or board rendering.
+    Rules match Game.play_round: a random first shooter, both players fire once per round, and player 1's ship is
+    checked first when both ships sink in the same round.
+    :param n_games: number of games to play
+    :param seed: seed for the random generator, for reproducible runs
+    :param replacement: when False, players never shoot the same cell twice
+    :return: SimulationResult
+    """
+    rng = random.Random(seed)
+    if not replacement:
+        return simulate_without_replacement(n_games, rng)
+
+    shot = rng.getrandbits  # One 6 bits draw is a uniform cell out of 64
+    bits = CELL_COUNT.bit_length() - 1
+    result = SimulationResult()
+
+    for _ in range(n_games):
+        ship_1 = random_ship_mask(rng)
+        ship_2 = random_ship_mask(rng)
+        first_shooter = rng.choice([PLAYER_1, PLAYER_2])
+        shots_1 = shots_2 = 0  # Cells shot on each player's own board
+        rounds = 0
+        while True:
+            rounds += 1
+            shots_1 |= 1 << shot(bits)
+            shots_2 |= 1 << shot(bits)
+            if shots_1 & ship_1 == ship_1:
+                result.add_game(PLAYER_2, first_shooter, rounds)
+                break
+            if shots_2 & ship_2 == ship_2:
+                result.add_game(PLAYER_1, first_shooter, rounds)
+                break
+
+    return result
+
+
+def simulate_without_replacement(n_games: int, rng):
+    """
+    Shooting every cell once in random order sinks the ship on the shot that reaches the last of its 3 cells, at a
+    position distributed as the largest of 3 distinct draws out of the 64 shot positions, wherever the ship is.
+    """
+    result = SimulationResult()
+    positions = range(1, CELL_COUNT + 1)
+    sample = rng.sample
+
+    for _ in range(n_games):
+        first_shooter = rng.choice([PLAYER_1, PLAYER_2])
+        sinks_1 = max(sample(positions, 3))  # Round player 1's ship sinks on
+        sinks_2 = max(sample(positions, 3))
+        if sinks_1 <= sinks_2:
+            result.add_game(PLAYER_2, first_shooter, sinks_1)
+        else:
+            result.add_game(PLAYER_1, first_shooter, sinks_2)
+
+    return result
+
+
+def simulate_games(n_games: int, seed=None, replacement: bool = True, player_1_strategy: str = None,
+                   player_2_strategy: str = None):
+    """
+    Same as simulate, but drives the Game object model, with one seeded random.Random shared by every Game
+    :param n_games: number of games to play
+    :param seed: seed for the random generator, for reproducible runs
+    :param replacement: when False, players never shoot the same cell twice
+    :param player_1_strategy: name of the strategy player 1 shoots with, a fresh one every game. Random when None
+    :param player_2_strategy: name of the strategy player 2 shoots with
+    :return: SimulationResult
+    """
+    rng = random.Random(seed)
+    result = SimulationResult()
+
+    for _ in range(n_games):
+        game = Game(verbose=False, rng=rng, replacement=replacement,
+                    player_1_strategy=make_strategy(player_1_strategy) if player_1_strategy else None,
+                    player_2_strategy=make_strategy(player_2_strategy) if player_2_strategy else None)
+        first_shooter = PLAYER_1 if game.shoots_first is game.player_1 else PLAYER_2
+        while not game.is_over:
+            game.play_round()
+        winner = PLAYER_1 if game.winner is game.player_1 else PLAYER_2
+        # Round 0 is ship placement, the round counter is one past the last round played
+        result.add_game(winner, first_shooter, game.round - 1)
+
+    return result
@@ -0,0 +1,214 @@
+import time
+
+from battleship import PLACEMENT_CELLS, PLACEMENT_MASKS, PLACEMENTS_BY_CELL, PlacementTracker
+from tools import make_rng
+
+CELL_COUNT = len(PLACEMENTS_BY_CELL)
+
+# Objectives: most likely hit next shot, or fewest shots expected until the ship sinks
+HIT_PROBABILITY = 'hit_probability'
+REMAINING_SHOTS = 'remaining_shots'
+OBJECTIVES = [HIT_PROBABILITY, REMAINING_SHOTS]
+
+# Shots with the highest hit probability that get rollouts under REMAINING_SHOTS
+ROLLOUT_CANDIDATES = 4
+
+# Consistent placements counted one by one, sampling only starts above this many
+EXACT_LIMIT = 1024
+
+
+class SolverResult:
+    """ Best shot found by the solver, with the statistics it was picked from"""
+    def __init__(self, shot: int, samples: int, hit_counts, expected_shots, elapsed_ms: float):
+        self._shot = shot
+        self._samples = samples
+        self._hit_counts = hit_counts
+        self._expected_shots = expected_shots
+        self._elapsed_ms = elapsed_ms
+
+    @property
+    def shot(self):
+        return self._shot
+
+    @property
+    def samples(self):
+        return self._samples
+
+    @property
+    def hit_counts(self):
+        """ Counted or sampled ships covering each cell"""
+        return self._hit_counts
+
+    @property
+    def expected_shots(self):
+        """ Mean rollout length until the ship sinks, by candidate shot. Empty for HIT_PROBABILITY"""
+        return self._expected_shots
+
+    @property
+    def elapsed_ms(self):
+        return self._elapsed_ms
+
+    def hit_probability(self, index: int):
+        return self._hit_counts[index] / self._samples if self._samples else 0.0
+
+    def __repr__(self):
+        return 'SolverResult(shot={}, samples={}, hit_probability={:.3f}, elapsed_ms={:.2f})'.format(
+            self.shot, self.samples, self.hit_probability(self.shot), self.elapsed_ms)
+
+
+class MonteCarloSolver:
+    """
+    Information-set Monte Carlo solver for the next shot on the opponent's board.
+    Ship placements consistent with the observed hits and misses are listed, and the unshot cell most often covered
+    wins. Up to exact_limit placements are all counted, which is exact and cheaper than drawing samples from the
+    list; only longer lists are sampled. With REMAINING_SHOTS, the best few cells are then compared by rolling out
+    the rest of the game against sampled ships. Anytime: it works in batches until the time budget runs out and
+    answers with the best shot so far.
+    """
+    def __init__(self, budget_ms: float = 2.0, objective: str = HIT_PROBABILITY, batch_size: int = 32,
+                 max_samples: int = None, max_rollouts: int = None, rng=None, clock=time.perf_counter,
+                 exact_limit: int = EXACT_LIMIT):
+        """
+        :param budget_ms: time allowed for one solve
+        :param objective: one of OBJECTIVES
+        :param batch_size: samples between two looks at the clock, rollouts look after each run
+        :param max_samples: stop sampling after this many samples, even with time left
+        :param max_rollouts: stop rolling out after this many rollouts, even with time left
+        :param rng: random.Random instance or seed, the random module by default
+        :param exact_limit: count every consistent placement up to this many, sample above. The classic board has 96
+        placements, so batch_size and max_samples only matter with an exact_limit below that
+        """
+        if objective not in OBJECTIVES:
+            raise Exception('Objective {} must be in allowed objectives list {}'.format(objective, OBJECTIVES))
+        for name, limit in [('Max samples', max_samples), ('Max rollouts', max_rollouts)]:
+            if limit is not None and limit < 1:
+                raise Exception('{} {} must be at least 1'.format(name, limit))
+        self._budget = budget_ms / 1000.0
+        self._objective = objective
+        self._batch_size = batch_size
+        self._max_samples = max_samples
+        self._max_rollouts = max_rollouts
+        self._rng = make_rng(rng)
+        self._clock = clock
+        self._exact_limit = exact_limit
+
+    @property
+    def objective(self):
+        return self._objective
+
+    @property
+    def rng(self):
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng):
+        self._rng = make_rng(rng)
+
+    @staticmethod
+    def candidates(hits: int, misses: int):
+        """ Placements consistent with the observations: covering every hit and no miss"""
+        if hits:
+            first_hit = (hits & -hits).bit_length() - 1
+            placements = PLACEMENTS_BY_CELL[first_hit]
+        else:
+            placements = range(len(PLACEMENT_CELLS))
+        return [placement for placement in placements
+                if not PLACEMENT_MASKS[placement] & misses and PLACEMENT_MASKS[placement] & hits == hits]
+
+    def solve(self, hits: int, misses: int):
+        """
+        :param hits: bit mask of the cells shot that housed a ship part
+        :param misses: bit mask of the cells shot that were water
+        :return: SolverResult
+        """
+        start = self._clock()
+        deadline = start + self._budget
+        shot = hits | misses
+        candidates = self.candidates(hits, misses)
+        if not candidates:
+            raise Exception('No ship placement is consistent with hits {:#x} and misses {:#x}'.format(hits, misses))
+
+        hit_counts = [0] * CELL_COUNT
+        if len(candidates) <= self._exact_limit:
+            for placement in candidates:
+                for cell in PLACEMENT_CELLS[placement]:
+                    hit_counts[cell] += 1
+            sampled = candidates
+        else:
+            sampled = self.sample(candidates, hit_counts, start)
+
+        ranked = sorted((cell for cell in range(CELL_COUNT) if not shot >> cell & 1),
+                        key=lambda cell: -hit_counts[cell])
+        expected_shots = {}
+        if self._objective == REMAINING_SHOTS:
+            expected_shots = self.rollouts(hits, misses, ranked[:ROLLOUT_CANDIDATES], sampled, deadline)
+        if expected_shots:
+            best = min(expected_shots, key=lambda cell: (expected_shots[cell], -hit_counts[cell]))
+        else:
+            best = ranked[0]
+
+        return SolverResult(best, len(sampled), hit_counts, expected_shots, (self._clock() - start) * 1000)
+
+    def sample(self, candidates, hit_counts, start: float):
+        """ Draw candidates until max_samples or the deadline, adding up the cells they cover into hit_counts"""
+        # Sampling uses half the budget when rollouts follow, the whole of it otherwise. One batch always runs
+        sampling_deadline = start + (self._budget / 2 if self._objective == REMAINING_SHOTS else self._budget)
+        sampled = []
+        rng = self._rng
+        while True:
+            batch = self._batch_size
+            if self._max_samples is not None:
+                batch = min(batch, self._max_samples - len(sampled))
+            for _ in range(batch):
+                placement = candidates[rng.randrange(len(candidates))]
+                sampled.append(placement)
+                for cell in PLACEMENT_CELLS[placement]:
+                    hit_counts[cell] += 1
+            if self._max_samples is not None and len(sampled) >= self._max_samples:
+                break
+            if self._clock() >= sampling_deadline:
+                break
+        return sampled
+
+    def rollouts(self, hits: int, misses: int, cells, sampled, deadline):
+        """ Mean shots to sink a ship drawn from sampled, opening with each of cells then shooting the highest count"""
+        tracker = PlacementTracker()
+        for cell in range(CELL_COUNT):
+            if misses >> cell & 1:
+                tracker.miss(cell)
+        for cell in range(CELL_COUNT):
+            if hits >> cell & 1:
+                tracker.hit(cell)
+
+        totals = {cell: 0 for cell in cells}
+        runs = 0
+        rng = self._rng
+        while self._max_rollouts is None or runs < self._max_rollouts:
+            ship = PLACEMENT_MASKS[sampled[rng.randrange(len(sampled))]]
+            for cell in cells:
+                totals[cell] += self.rollout(tracker.copy(), hits | misses, ship, cell)
+            runs += 1
+            if self._clock() >= deadline:
+                break
+        return {cell: total / runs for cell, total in totals.items()}
+
+    @staticmethod
+    def rollout(tracker: PlacementTracker, shot: int, ship: int, first: int):
+        """ Shots needed to sink ship, starting with first, then always shooting the cell with the highest count"""
+        remaining = ship & ~shot
+        cell = first
+        shots = 0
+        while True:
+            shots += 1
+            bit = 1 << cell
+            shot |= bit
+            if ship & bit:
+                remaining &= ~bit
+                if not remaining:
+                    return shots
+                tracker.hit(cell)
+            else:
+                tracker.miss(cell)
+            counts = tracker.counts
+            cell = max((index for index in range(CELL_COUNT) if counts[index] and not shot >> index & 1),
+                       key=counts.__getitem__)
@@ -0,0 +1,401 @@
+from array import array
+from collections import deque
+
+from battleship import CLASSIC_FLEET, PLACEMENT_CELLS, PLACEMENT_MASKS, PLACEMENTS_BY_CELL, Board, PlacementTracker
+from solver import HIT_PROBABILITY, MonteCarloSolver
+
+
+def neighbor_indexes(index: int, width: int, height: int):
+    """ Cells above, below, before and after a cell, same neighbors as Cell.above/below/before/after"""
+    row, col = divmod(index, width)
+    neighbors = []
+    if row > 0:
+        neighbors.append(index - width)
+    if row < height - 1:
+        neighbors.append(index + width)
+    if col > 0:
+        neighbors.append(index - 1)
+    if col < width - 1:
+        neighbors.append(index + 1)
+    return neighbors
+
+
+class CellPool:
+    """ Cells not shot yet, supports O(1) random draw and O(1) removal of any cell. Arrays keep big boards compact"""
+    def __init__(self, cells, size: int):
+        """
+        :param cells: indexes of the cells in the pool
+        :param size: number of cells on the board
+        """
+        self._cells = array('i', cells)
+        self._positions = array('i', [-1]) * size  # Position of every cell in the pool, -1 when not in it
+        for position, cell in enumerate(self._cells):
+            self._positions[cell] = position
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __contains__(self, cell):
+        return self._positions[cell] >= 0
+
+    def remove(self, cell):
+        position = self._positions[cell]
+        if position < 0:
+            return
+        self._positions[cell] = -1
+        last = self._cells.pop()
+        if last != cell:
+            self._cells[position] = last
+            self._positions[last] = position
+
+    def draw(self, rng):
+        cell = self._cells[rng.randrange(len(self._cells))]
+        self.remove(cell)
+        return cell
+
+
+class Strategy:
+    """
+    Picks the cells a player shoots on the opponent's board.
+    Game.shoot asks next_shot for a cell, then reports the outcome to observe, so a strategy keeps its state
+    up to date shot by shot instead of scanning the board.
+    """
+    name = None
+    interactive = False  # True when ready may return False, Game.play_round only asks interactive strategies
+
+    def __init__(self, width: int = len(Board.columns), height: int = len(Board.rows), fleet=CLASSIC_FLEET):
+        """
+        :param width: number of columns of the board shot at
+        :param height: number of rows of the board shot at
+        :param fleet: length of every ship on the board shot at
+        """
+        self._width = width
+        self._height = height
+        self._fleet = tuple(fleet)
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def fleet(self):
+        return self._fleet
+
+    def require_classic_game(self):
+        """ Raise unless the board shot at is the classic board with the classic fleet"""
+        if (self.width, self.height) != (len(Board.columns), len(Board.rows)) or self.fleet != CLASSIC_FLEET:
+            raise Exception('Strategy {} only plays {}x{} boards with fleet {}, not {}x{} with fleet {}'.format(
+                self.name, len(Board.columns), len(Board.rows), list(CLASSIC_FLEET), self.width, self.height,
+                list(self.fleet)))
+
+    def next_shot(self, board: Board):
+        """
+        :param board: opponent's board, only its random generator and shots mask are meant to be used
+        :return: index of the cell to shoot
+        """
+        raise NotImplementedError
+
+    def observe(self, index: int, hit: bool, sunk: bool):
+        """ Outcome of the shot at index"""
+
+    def next_placement(self):
+        """ Index in PLACEMENT_CELLS of the player's own ship, None to keep the random one"""
+        return None
+
+    def ready(self, round_number: int):
+        """
+        False while the strategy waits for input it needs to play round_number, see Game.play_round. Only asked when
+        interactive is True
+        """
+        return True
+
+    def __repr__(self):
+        return self.name
+
+
+class RandomStrategy(Strategy):
+    """ Fire at random, the original behavior of Game.shoot"""
+    name = 'random'
+
+    def __init__(self, replacement: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self._replacement = replacement
+
+    def next_shot(self, board: Board):
+        if self._replacement:
+            return board.get_random_index(board.rng)
+        return board.get_random_unshot_index()
+
+
+class HuntTargetStrategy(Strategy):
+    """ Fire at random until a hit, then probe the cells above, below, before and after every hit"""
+    name = 'hunt_target'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._untried = CellPool(range(self.width * self.height), self.width * self.height)
+        self._targets = []  # Cells to probe, the last one first
+        self._hits = []  # Hits on the ship not sunk yet
+
+    def hunt_pool(self):
+        return self._untried
+
+    def next_shot(self, board: Board):
+        while self._targets:
+            index = self._targets.pop()
+            if index in self._untried:
+                return index
+        pool = self.hunt_pool()
+        if not len(pool):
+            pool = self._untried
+        return pool.draw(board.rng)
+
+    def observe(self, index: int, hit: bool, sunk: bool):
+        self._untried.remove(index)
+        if not hit:
+            return
+        if sunk:
+            # Probes left may still find the other ships of a fleet
+            self._hits = []
+            return
+
+        neighbors = [cell for cell in neighbor_indexes(index, self.width, self.height) if cell in self._untried]
+        # Once two hits line up, probe along that line first
+        aligned = [cell for cell in neighbors if any(self.aligned(cell, index, hit_cell) for hit_cell in self._hits)]
+        self._targets.extend(cell for cell in neighbors if cell not in aligned)
+        self._targets.extend(aligned)
+        self._hits.append(index)
+
+    def aligned(self, cell: int, index: int, other: int):
+        """ True when the 3 cells are on one row or one column"""
+        if cell // self.width == index // self.width == other // self.width:
+            return True
+        return cell % self.width == index % self.width == other % self.width
+
+
+class ParityStrategy(HuntTargetStrategy):
+    """ Hunt/target that hunts on a checkerboard only, every ship of 2 cells or more covers one of its cells"""
+    name = 'parity'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._parity_untried = CellPool((index for index in range(self.width * self.height)
+                                         if (index // self.width + index % self.width) % 2 == 0),
+                                        self.width * self.height)
+
+    def hunt_pool(self):
+        return self._parity_untried
+
+    def observe(self, index: int, hit: bool, sunk: bool):
+        self._parity_untried.remove(index)
+        super().observe(index, hit, sunk)
+
+
+def build_placement_buckets():
+    """ Mask of the cells covered by every number of placements, indexed by that number"""
+    buckets = [0] * (max(len(placements) for placements in PLACEMENTS_BY_CELL) + 1)
+    for cell, placements in enumerate(PLACEMENTS_BY_CELL):
+        buckets[len(placements)] |= 1 << cell
+    return tuple(buckets)
+
+
+PLACEMENT_BUCKETS = build_placement_buckets()
+
+
+class RankedPlacementTracker(PlacementTracker):
+    """ PlacementTracker that also keeps the mask of the cells of every count, moving a cell whenever its count drops"""
+    def __init__(self):
+        super().__init__()
+        self._buckets = list(PLACEMENT_BUCKETS)
+
+    @property
+    def buckets(self):
+        """ Mask of the cells of every count, indexed by count"""
+        return self._buckets
+
+    def copy(self):
+        tracker = RankedPlacementTracker()
+        tracker._alive = self._alive
+        tracker._counts = list(self._counts)
+        tracker._buckets = list(self._buckets)
+        return tracker
+
+    def discount(self, ruled_out: int):
+        counts = self._counts
+        buckets = self._buckets
+        while ruled_out:
+            lowest = ruled_out & -ruled_out
+            for cell in PLACEMENT_CELLS[lowest.bit_length() - 1]:
+                count = counts[cell] - 1
+                counts[cell] = count
+                bit = 1 << cell
+                buckets[count + 1] ^= bit
+                buckets[count] |= bit
+            ruled_out ^= lowest
+
+    def recount(self, alive: int):
+        super().recount(alive)
+        # Only cells of the few placements left have a count
+        covered = 0
+        while alive:
+            lowest = alive & -alive
+            covered |= PLACEMENT_MASKS[lowest.bit_length() - 1]
+            alive ^= lowest
+        self._buckets = [0] * len(self._buckets)
+        self._buckets[0] = (1 << len(self._counts)) - 1 ^ covered
+        while covered:
+            lowest = covered & -covered
+            self._buckets[self._counts[lowest.bit_length() - 1]] |= lowest
+            covered ^= lowest
+
+
+class ProbabilityDensityStrategy(Strategy):
+    """
+    Fire at the cell covered by the most ship placements still consistent with the observed misses and hits.
+    A RankedPlacementTracker keeps the cells of every count, a shot only moves the cells of the placements it rules
+    out. Counts only go down, so the best count is found by walking down from the last one.
+    Only plays the classic board and ship.
+    """
+    name = 'density'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.require_classic_game()
+        self._tracker = RankedPlacementTracker()
+        self._untried = (1 << self.width * self.height) - 1
+        self._best = len(self._tracker.buckets) - 1  # No untried cell has a higher count
+
+    @property
+    def counts(self):
+        return self._tracker.counts
+
+    def next_shot(self, board: Board):
+        buckets = self._tracker.buckets
+        while self._best and not buckets[self._best] & self._untried:
+            self._best -= 1
+        # Ties are drawn in index order
+        best = buckets[self._best] & self._untried
+        for _ in range(board.rng.randrange(bin(best).count('1'))):
+            best &= best - 1
+        return (best & -best).bit_length() - 1
+
+    def observe(self, index: int, hit: bool, sunk: bool):
+        self._untried &= ~(1 << index)
+        if hit:
+            self._tracker.hit(index)
+        else:
+            self._tracker.miss(index)
+
+
+class SolverStrategy(Strategy):
+    """
+    Fire at the shot picked by a MonteCarloSolver from the hits and misses observed so far, within a time budget
+    per shot. Without an rng of its own, the solver draws from the generator of the board shot at, like the other
+    strategies. Only plays the classic board and ship.
+    """
+    name = 'solver'
+
+    def __init__(self, budget_ms: float = 2.0, objective: str = HIT_PROBABILITY, max_rollouts: int = None, rng=None,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.require_classic_game()
+        # The 96 classic placements are always counted exactly, the solver never samples them
+        self._solver = MonteCarloSolver(budget_ms, objective, max_rollouts=max_rollouts, rng=rng)
+        self._board_rng = rng is None  # Solver follows the rng of the board it shoots at
+        self._hits = 0
+        self._misses = 0
+        self._last_result = None
+
+    @property
+    def solver(self):
+        return self._solver
+
+    @property
+    def last_result(self):
+        """ SolverResult behind the last shot"""
+        return self._last_result
+
+    def next_shot(self, board: Board):
+        if self._board_rng and self._solver.rng is not board.rng:
+            self._solver.rng = board.rng
+        self._last_result = self._solver.solve(self._hits, self._misses)
+        return self._last_result.shot
+
+    def observe(self, index: int, hit: bool, sunk: bool):
+        if hit:
+            self._hits |= 1 << index
+        else:
+            self._misses |= 1 << index
+
+
+class InputStrategy(Strategy):
+    """
+    Placement and shots supplied by a human or a client, as cell labels like B4. Input is queued when it arrives
+    and never waited for: Game.play_round skips the round until ready, so one loop drives humans and bots alike.
+    Only plays the classic board and ship.
+    """
+    name = 'input'
+    interactive = True
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.require_classic_game()
+        self._placement = None
+        self._shots = deque()  # Indexes of the cells to shoot, oldest first
+
+    @property
+    def placement(self):
+        return self._placement
+
+    @property
+    def pending(self):
+        """ Shots queued and not fired yet"""
+        return len(self._shots)
+
+    def place(self, front: str, orientation: str):
+        """ Put the ship with its front on a cell like B4, running down (V) or right (H)"""
+        self._placement = Board.parse_placement(front, orientation)
+
+    def fire(self, label: str):
+        """ Queue a shot at a cell like B4"""
+        self._shots.append(Board.parse_cell(label))
+
+    def feed(self, line: str):
+        """ Take a line of input: a cell and an orientation places the ship, a cell alone is a shot"""
+        words = line.split()
+        if len(words) == 2:
+            self.place(*words)
+        elif len(words) == 1:
+            self.fire(words[0])
+        else:
+            raise Exception('Input {} must be a cell like B4, or a cell and an orientation like B4 V'.format(line))
+
+    def next_placement(self):
+        return self._placement
+
+    def ready(self, round_number: int):
+        return self._placement is not None if round_number == 0 else bool(self._shots)
+
+    def next_shot(self, board: Board):
+        return self._shots.popleft()
+
+
+STRATEGIES = {strategy.name: strategy for strategy in
+              [RandomStrategy, HuntTargetStrategy, ParityStrategy, ProbabilityDensityStrategy, SolverStrategy,
+               InputStrategy]}
+
+
+def make_strategy(strategy, **kwargs):
+    """
+    :param strategy: Strategy instance, or name of a built-in strategy to create
+    :return: Strategy
+    """
+    if isinstance(strategy, Strategy):
+        return strategy
+    if strategy not in STRATEGIES:
+        raise Exception('Strategy {} must be in allowed strategies list {}'.format(strategy, sorted(STRATEGIES)))
+    return STRATEGIES[strategy](**kwargs)
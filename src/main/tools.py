@@ -1,12 +1,62 @@
+import os
+import random
+import sys
+
+
+def stream_supports_color(stream=None):
+    """ Colors are only worth their escape codes on a terminal, and never when NO_COLOR is set"""
+    stream = sys.stdout if stream is None else stream
+    isatty = getattr(stream, 'isatty', None)
+    return 'NO_COLOR' not in os.environ and isatty is not None and isatty()
+
+
+# Escape codes are left out of everything printed when False
+color_enabled = stream_supports_color()
+
+
+def set_color_enabled(enabled: bool):
+    global color_enabled
+    color_enabled = enabled
+
 
 def colored(text, color):
+    if not color_enabled:
+        return text
     return '{}{}{}'.format(getattr(FG, color), text, Colors.reset)
 
 
 def colored_background(text, color):
+    if not color_enabled:
+        return text
     return '{}{}{}'.format(getattr(BG, color), text, Colors.reset)
 
 
+def format_cell_print(label: str, part_letter: str, hit: bool, has_ship: bool, color: bool = True):
+    """ Print of a cell, for example A1[fx] for the hit front of a ship on A1, ship cells on an orange background"""
+    if not color:
+        return '{}[{}{}]'.format(label, part_letter, 'x' if hit else 'o')
+    mark = '{}x{}'.format(FG.red, Colors.reset) if hit else '{}o{}'.format(FG.green, Colors.reset)
+    cell_print = '{}[{}{}]'.format(label, part_letter, mark)
+    if has_ship:
+        return '{}{}{}{}{}'.format(FG.blue, BG.orange, cell_print, Colors.reset, Colors.reset)
+    return cell_print
+
+
+def build_cell_prints(labels, part_letters, color: bool = True):
+    """
+    Every possible cell print, formatted once
+    :param labels: label of every cell, for example A1
+    :param part_letters: letter of every part code, the first one for cells housing no ship part
+    :param color: with escape codes or not
+    :return: nested tuples, print of a cell state by [cell][part code][hit]
+    """
+    return tuple(
+        tuple(
+            tuple(format_cell_print(label, part_letter, hit, part_code != 0, color) for hit in (False, True))
+            for part_code, part_letter in enumerate(part_letters))
+        for label in labels)
+
+
 class Colors:
     reset = '\033[0m'
     bold = '\033[01m'
@@ -44,3 +94,49 @@ class BG:
     purple = '\033[45m'
     cyan = '\033[46m'
     light_grey = '\033[47m'
+
+
+# Values make_rng turns into a new random.Random
+SEED_TYPES = (int, float, str, bytes, bytearray)
+
+
+def make_rng(rng=None):
+    """
+    :param rng: None for the random module, a seed for a new random.Random, or an object with the random.Random API
+    :return: random number generator
+    """
+    if rng is None:
+        return random
+    if isinstance(rng, SEED_TYPES):
+        return random.Random(rng)
+    return rng
+
+
+def draw_unshot(pool, rng, is_hit):
+    """
+    Random cell of a swap-remove pool of cells not shot yet: the cell drawn is replaced by the last one of the pool
+    :param pool: list or array of cell indexes, drawn cells are removed from it
+    :param is_hit: function telling whether a cell index was shot since the pool was built, such cells are skipped
+    :return: cell index, None once the pool is empty
+    """
+    while pool:
+        position = rng.randrange(len(pool))
+        index = pool[position]
+        pool[position] = pool[-1]
+        pool.pop()
+        if not is_hit(index):
+            return index
+    return None
+
+
+class Cursor:
+    clear_screen = '\033[2J'
+    clear_line = '\033[2K'
+    home = '\033[H'
+    hide = '\033[?25l'
+    show = '\033[?25h'
+
+
+def move_cursor(line, column):
+    """ Escape code moving the cursor to a line and column, both starting at 1"""
+    return '\033[{};{}H'.format(line, column)
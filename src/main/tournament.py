@@ -0,0 +1,64 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from simulation import SimulationResult, simulate, simulate_games
+from vectorized import simulate_vectorized
+
+# Simulation engines a tournament can run, each takes (n_games, seed=...) and returns a SimulationResult
+ENGINES = {
+    'fast': simulate,
+    'game': simulate_games,
+    'vectorized': simulate_vectorized,
+}
+
+# Games per shard. Shards, not workers, own a seed, so results do not depend on the worker count
+DEFAULT_SHARD_SIZE = 10000
+
+
+def shard_sizes(n_games: int, shard_size: int = DEFAULT_SHARD_SIZE):
+    if shard_size < 1:
+        raise Exception('Shard size {} must be at least 1'.format(shard_size))
+    full_shards, rest = divmod(n_games, shard_size)
+    return [shard_size] * full_shards + ([rest] if rest else [])
+
+
+def shard_seeds(master_seed, n_shards: int):
+    """ Independent 64 bits seeds, one per shard, all derived from the master seed"""
+    rng = random.Random(master_seed)
+    return [rng.getrandbits(64) for _ in range(n_shards)]
+
+
+def play_shard(engine: str, n_games: int, seed: int):
+    return ENGINES[engine](n_games, seed=seed)
+
+
+def run_tournament(n_games: int, seed=None, workers: int = None, shard_size: int = DEFAULT_SHARD_SIZE,
+                   engine: str = 'fast'):
+    """
+    Shard a batch of games across a process pool and merge the shard results.
+    The summary is identical for a given master seed and shard size, whatever the number of workers.
+    :param n_games: number of games to play
+    :param seed: master seed every shard seed is derived from
+    :param workers: number of worker processes, one per core by default. 1 plays every shard in this process
+    :param shard_size: number of games per shard
+    :param engine: name of the simulation engine, one of ENGINES
+    :return: SimulationResult
+    """
+    if engine not in ENGINES:
+        raise Exception('Engine {} must be in allowed engines list {}'.format(engine, sorted(ENGINES)))
+
+    sizes = shard_sizes(n_games, shard_size)
+    seeds = shard_seeds(seed, len(sizes))
+    engines = [engine] * len(sizes)
+    result = SimulationResult()
+
+    if workers == 1:
+        for shard_result in map(play_shard, engines, sizes, seeds):
+            result.merge(shard_result)
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard_result in executor.map(play_shard, engines, sizes, seeds):
+            result.merge(shard_result)
+
+    return result
@@ -0,0 +1,98 @@
+try:
+    import numpy
+except ImportError:  # numpy is optional, only this engine needs it
+    numpy = None
+
+from battleship import Board
+from simulation import SimulationResult
+
+# Games advanced together per batch, bounds the memory of the lockstep arrays
+DEFAULT_BATCH_SIZE = 100000
+
+
+def require_numpy():
+    if numpy is None:
+        raise ImportError('The vectorized engine requires numpy, install it with "pip install numpy"')
+    return numpy
+
+
+def random_ship_masks(n_ships: int, rng):
+    """
+    Draw ship placements in bulk with the same rules as Ship.__init__
+    :param n_ships: number of ships to place
+    :param rng: numpy.random.Generator
+    :return: uint64 array, one bitboard of the 3 cells covered by each ship
+    """
+    np = require_numpy()
+    width = len(Board.columns)
+    all_cols = np.arange(width)
+    all_rows = np.arange(len(Board.rows))
+    middle_cols = np.array([Board.COLUMN_INDEXES[col] for col in Board.middle_columns])
+    middle_rows = np.array([row - 1 for row in Board.rows if row in Board.middle_rows])
+    placements = np.array(Board.SHIP_PLACEMENTS)
+
+    vertical = placements[rng.integers(0, len(placements), n_ships)] == Board.VERTICAL
+    # Vertical: any column and a middle row. Horizontal: a middle column and any row
+    col = np.where(vertical, all_cols[rng.integers(0, len(all_cols), n_ships)],
+                   middle_cols[rng.integers(0, len(middle_cols), n_ships)])
+    row = np.where(vertical, middle_rows[rng.integers(0, len(middle_rows), n_ships)],
+                   all_rows[rng.integers(0, len(all_rows), n_ships)])
+    middle = (row * width + col).astype(np.uint64)
+    step = np.where(vertical, width, 1).astype(np.uint64)
+
+    one = np.uint64(1)
+    return (one << (middle - step)) | (one << middle) | (one << (middle + step))
+
+
+def simulate_vectorized(n_games: int, seed=None, batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Play games in lockstep on uint64 bitboards, one vectorized step per round.
+    Rules match Game.play_round and simulation.simulate, finished games are dropped from the arrays after each round.
+    :param n_games: number of games to play
+    :param seed: seed for numpy's random generator
+    :param batch_size: games held in memory at once
+    :return: SimulationResult
+    """
+    np = require_numpy()
+    rng = np.random.default_rng(seed)
+    cell_count = len(Board.columns) * len(Board.rows)
+    one = np.uint64(1)
+    result = SimulationResult()
+
+    remaining = n_games
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        remaining -= size
+
+        ship_1 = random_ship_masks(size, rng)
+        ship_2 = random_ship_masks(size, rng)
+        player_1_first = rng.integers(0, 2, size).astype(bool)
+        shots_1 = np.zeros(size, dtype=np.uint64)  # Cells shot on each player's own board
+        shots_2 = np.zeros(size, dtype=np.uint64)
+
+        rounds = 0
+        while ship_1.size:
+            rounds += 1
+            active = ship_1.size
+            shots_1 |= one << rng.integers(0, cell_count, active, dtype=np.uint64)
+            shots_2 |= one << rng.integers(0, cell_count, active, dtype=np.uint64)
+
+            # Player 1's ship is checked first, as in Game.play_round
+            sunk_1 = (shots_1 & ship_1) == ship_1
+            sunk_2 = ~sunk_1 & ((shots_2 & ship_2) == ship_2)
+            over = sunk_1 | sunk_2
+            if not over.any():
+                continue
+
+            player_2_wins = int(np.count_nonzero(sunk_1))
+            player_1_wins = int(np.count_nonzero(sunk_2))
+            first_shooter_wins = int(np.count_nonzero(sunk_2 & player_1_first)
+                                     + np.count_nonzero(sunk_1 & ~player_1_first))
+            result.add_games(rounds, player_1_wins, player_2_wins, first_shooter_wins)
+
+            playing = ~over
+            ship_1, ship_2 = ship_1[playing], ship_2[playing]
+            shots_1, shots_2 = shots_1[playing], shots_2[playing]
+            player_1_first = player_1_first[playing]
+
+    return result
@@ -0,0 +1,68 @@
+import unittest
+import analytic
+import simulation
+
+
+class SinkDistributionTest(unittest.TestCase):
+    def test_without_replacement(self):
+        sink = analytic.sink_distribution(64, 3, replacement=False)
+        self.assertEqual(len(sink), 65)
+        self.assertAlmostEqual(sum(sink), 1.0)
+        self.assertEqual(sink[2], 0.0)
+        self.assertAlmostEqual(sink[3], 1 / 41664)
+        # Last of 3 positions out of 64: mean 3 * 65 / 4
+        self.assertAlmostEqual(sum(shot * p for shot, p in enumerate(sink)), 48.75)
+
+    def test_with_replacement(self):
+        sink = analytic.sink_distribution(64, 3, replacement=True)
+        self.assertAlmostEqual(sum(sink), 1.0, places=10)
+        self.assertEqual(sink[1], 0.0)
+        # 3 shots sink the ship only when they hit its 3 cells in any order
+        self.assertAlmostEqual(sink[3], 6 / 64 ** 3)
+        # Collecting 3 given cells out of 64 takes 64 * (1 + 1/2 + 1/3) shots on average
+        self.assertAlmostEqual(sum(shot * p for shot, p in enumerate(sink)), 64 * 11 / 6, places=6)
+        self.assertRaises(Exception, analytic.sink_distribution, 2, 3)
+
+    def test_single_cell_ship(self):
+        sink = analytic.sink_distribution(4, 1, replacement=True)
+        self.assertAlmostEqual(sink[1], 1 / 4)
+        self.assertAlmostEqual(sink[2], 3 / 16)
+
+
+class OutcomeDistributionTest(unittest.TestCase):
+    def test_outcome(self):
+        for replacement in [True, False]:
+            outcome = analytic.OutcomeDistribution(replacement=replacement)
+            self.assertAlmostEqual(sum(outcome.rounds.values()), 1.0, places=10)
+            self.assertAlmostEqual(sum(outcome.wins.values()), 1.0, places=10)
+            # Ties go to player 2, and only ties break the symmetry between players
+            self.assertAlmostEqual(outcome.wins[simulation.PLAYER_2] - outcome.wins[simulation.PLAYER_1],
+                                   outcome.tie_rate)
+            self.assertAlmostEqual(outcome.first_shooter_advantage, 0.0)
+
+    def test_board_sizes(self):
+        small = analytic.OutcomeDistribution(4, 4, replacement=False)
+        self.assertEqual(max(small.rounds), 16)
+        self.assertLess(small.mean_rounds, analytic.OutcomeDistribution(replacement=False).mean_rounds)
+        self.assertRaises(Exception, analytic.OutcomeDistribution, 2, 2)
+
+    def test_cross_check_game(self):
+        # Game.play_round frequencies stay within sampling error of the exact distribution
+        for replacement in [True, False]:
+            outcome = analytic.OutcomeDistribution(replacement=replacement)
+            differences = outcome.compare(simulation.simulate_games(2000, seed=3, replacement=replacement))
+            self.assertLess(abs(differences['player_1_win_rate']), 0.06)
+            self.assertLess(abs(differences['first_shooter_win_rate']), 0.06)
+            self.assertLess(abs(differences['mean_rounds']), 0.1 * outcome.mean_rounds)
+
+    def test_cross_check_simulate(self):
+        for replacement in [True, False]:
+            outcome = analytic.OutcomeDistribution(replacement=replacement)
+            differences = outcome.compare(simulation.simulate(50000, seed=5, replacement=replacement))
+            self.assertLess(abs(differences['player_1_win_rate']), 0.012)
+            self.assertLess(abs(differences['mean_rounds']), 0.02 * outcome.mean_rounds)
+            self.assertLess(differences['rounds'], 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
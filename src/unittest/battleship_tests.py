@@ -1,5 +1,7 @@
+import random
 import unittest
 import battleship
+import tools
 
 
 class CellTest(unittest.TestCase):
@@ -35,6 +37,20 @@ class CellTest(unittest.TestCase):
 
         self.assertRaises(Exception, battleship.Cell, 'D', 49)
 
+    def test_cell_neighbors_shared(self):
+        # Neighbors come from one table, cells at the same place share the same tuples
+        self.assertIs(battleship.Cell('C', 3).above, battleship.Cell('C', 3).above)
+        self.assertEqual(len(battleship.NEIGHBORS), 64)
+        # Moving a cell moves its neighbors
+        cell = battleship.Cell('A', 1)
+        cell.row = 2
+        self.assertEqual(cell.above, ('A', 1))
+
+    def test_slots(self):
+        board = battleship.Board(rng=1)
+        for instance in [self.cell, board.ship, board, battleship.Player('Slim', rng=1)]:
+            self.assertFalse(hasattr(instance, '__dict__'))
+
 
 class BoardTest(unittest.TestCase):
     def setUp(self) -> None:
@@ -49,6 +65,37 @@ class BoardTest(unittest.TestCase):
         self.assertEqual(self.board.middle_rows, [2, 3, 4, 5, 6, 7])
         self.assertEqual(self.board.middle_columns, ['B', 'C', 'D', 'E', 'F', 'G'])
 
+    def test_cell_index(self):
+        for index in range(0, 64):
+            col, row = self.board.cell_coordinates(index)
+            self.assertEqual(self.board.cell_index(col, row), index)
+            self.assertEqual(self.board.get_cell_at(index).col, col)
+        self.assertEqual(self.board.cell_coordinates(11), ('D', 2))
+        self.assertIs(self.board.get_cell_at(11), self.board.get_cell('D', 2))
+        self.assertRaises(Exception, self.board.get_cell, 'I', 2)
+        self.assertRaises(Exception, self.board.get_cell, 'D', 9)
+
+    def test_parse_cell(self):
+        self.assertEqual(self.board.parse_cell('A1'), 0)
+        self.assertEqual(self.board.parse_cell(' b4 '), self.board.cell_index('B', 4))
+        self.assertEqual(self.board.parse_cell('H8'), 63)
+        self.assertRaises(Exception, self.board.parse_cell, 'I1')
+        self.assertRaises(Exception, self.board.parse_cell, 'A9')
+
+    def test_parse_placement(self):
+        self.assertEqual(battleship.PLACEMENT_CELLS[self.board.parse_placement('B4', 'V')], (25, 33, 41))
+        self.assertEqual(battleship.PLACEMENT_CELLS[self.board.parse_placement('f8', 'h')], (61, 62, 63))
+        self.assertRaises(Exception, self.board.parse_placement, 'G1', 'H')
+        self.assertRaises(Exception, self.board.parse_placement, 'A7', 'V')
+        self.assertRaises(Exception, self.board.parse_placement, 'A1', 'D')
+
+    def test_place_ship_at_placement(self):
+        board = battleship.Board(rng=1)
+        board.place_ship(board.parse_placement('C2', 'H'))
+        self.assertEqual(board.ship_mask, (1 << 10) | (1 << 11) | (1 << 12))
+        self.assertEqual(board.get_part(10), 'Front')
+        self.assertEqual(board.ship.rear.col, 'E')
+
     def test_get_random_middle_cell(self):
         for i in range(0, 100000):
             # Row 1 and 8 cannot be used for middle of ship in vertical place
@@ -80,6 +127,93 @@ class BoardTest(unittest.TestCase):
                 self.assertEqual(cell.row, row)
                 self.assertEqual(cell.col, col)
 
+    def test_board_copy_on_write(self):
+        board_1 = battleship.Board(rng=1)
+        board_2 = battleship.Board(rng=2)
+        # Empty boards share one immutable template, shots do not copy it
+        self.assertIs(board_1.parts, board_2.parts)
+        board_1.shoot(3)
+        self.assertIs(board_1.parts, battleship.Board.EMPTY_PARTS)
+        # The first part placed gives the board its own copy
+        board_1.place_ship()
+        self.assertIsNot(board_1.parts, board_2.parts)
+        self.assertEqual(sum(1 for code in board_1.parts if code), 3)
+        self.assertFalse(any(board_2.parts))
+        self.assertFalse(any(battleship.Board.EMPTY_PARTS))
+        # Removing the ship goes back to the template
+        board_1.restore((0, 0))
+        self.assertIs(board_1.parts, battleship.Board.EMPTY_PARTS)
+
+    def test_board_state(self):
+        board = battleship.Board()
+        self.assertEqual(len(board.parts), 64)
+        self.assertFalse(any(board.parts))
+        self.assertEqual(board.shots, 0)
+        self.assertEqual(board.ship_mask, 0)
+
+        # Cells handed out are views of the board state
+        cell = board.get_cell('C', 2)
+        self.assertIs(board.get_cell('C', 2), cell)
+        cell.hit = True
+        self.assertEqual(board.shots, 1 << board.cell_index('C', 2))
+
+        # Placing the ship stores its parts, the ship sees hits made through the board
+        board.place_ship()
+        ship = board.ship
+        for part in [ship.front, ship.middle, ship.rear]:
+            placed = board.get_cell(part.col, part.row)
+            self.assertIs(placed, part)
+            placed.hit = True
+        ship.sink()
+        self.assertTrue(ship.sunk)
+        self.assertTrue(board.sunk)
+
+    def test_bitboard(self):
+        board = battleship.Board()
+        board.place_ship()
+        ship = board.ship
+        ship_cells = [board.cell_index(part.col, part.row) for part in [ship.front, ship.middle, ship.rear]]
+        self.assertEqual(bin(board.ship_mask).count('1'), 3)
+        self.assertFalse(board.sunk)
+
+        water = next(index for index in range(64) if index not in ship_cells)
+        self.assertFalse(board.shoot(water))
+        self.assertTrue(board.get_cell_at(water).hit)
+        for index in ship_cells:
+            self.assertFalse(board.sunk)
+            self.assertTrue(board.shoot(index))
+        self.assertTrue(board.sunk)
+
+    def test_replace_cell(self):
+        board = battleship.Board()
+        old_cell = board.get_cell('A', 1)
+        old_cell.hit = True
+        new_cell = battleship.Cell('A', 1, part='Front')
+        board.replace_cell_on_the_board(new_cell)
+        self.assertIs(board.get_cell('A', 1), new_cell)
+        self.assertEqual(board.get_cell('A', 1).part, 'Front')
+        self.assertFalse(board.get_cell('A', 1).hit)
+
+        # The replaced cell keeps its own state and no longer writes to the board
+        self.assertTrue(old_cell.hit)
+        old_cell.part = 'Rear'
+        self.assertEqual(new_cell.part, 'Front')
+
+    def test_get_random_unshot_index(self):
+        board = battleship.Board(rng=1)
+        board.get_cell('B', 3).hit = True
+        drawn = []
+        index = board.get_random_unshot_index()
+        while index is not None:
+            drawn.append(index)
+            board.shoot(index)
+            # Cells hit through a view after the pool was built are skipped too
+            if len(drawn) == 10:
+                board.get_cell('H', 8).hit = True
+            index = board.get_random_unshot_index()
+        self.assertEqual(len(drawn), len(set(drawn)))
+        self.assertEqual(sorted(drawn + [board.cell_index('B', 3), board.cell_index('H', 8)]), list(range(0, 64)))
+
     def test_get_random_cell(self):
         for i in range(0, 10000):
             cell = self.board.get_random_cell()
@@ -87,6 +221,54 @@ class BoardTest(unittest.TestCase):
             self.assertIsNotNone(self.board.get_cell(cell.col, cell.row))
 
 
+class BoardRenderTest(unittest.TestCase):
+    @staticmethod
+    def render(board):
+        # Board printed cell by cell, as the render cache must print it
+        board_print = ''
+        for row in board.rows:
+            row_print = ''
+            for col in board.columns:
+                cell = board.get_cell(col, row)
+                row_print = '{}{} '.format(row_print, battleship.format_cell(col, row, cell.part, cell.hit))
+            board_print = '{}\n{}'.format(board_print, row_print)
+        return board_print
+
+    def test_render_cache(self):
+        rng = random.Random(2)
+        board = battleship.Board(rng=rng)
+        self.assertEqual(str(board), self.render(board))
+        board.place_ship()
+        self.assertEqual(str(board), self.render(board))
+        for i in range(0, 80):
+            board.shoot(rng.randrange(64))
+            if i % 9 == 0:
+                board.get_cell('E', 2).hit = True
+            if i % 13 == 0:
+                board.replace_cell_on_the_board(battleship.Cell('B', 7, part='Middle'))
+            self.assertEqual(str(board), self.render(board))
+
+        # Nothing changed: the cached string is handed out again
+        self.assertIs(repr(board), repr(board))
+        board.invalidate_render()
+        self.assertEqual(str(board), self.render(board))
+
+    def test_color_modes(self):
+        color_enabled = tools.color_enabled
+        board = battleship.Board()
+        board.place_ship()
+        try:
+            tools.set_color_enabled(True)
+            self.assertIn('\033[', str(board))
+            # Switching color mode renders the whole board again
+            tools.set_color_enabled(False)
+            self.assertNotIn('\033[', str(board))
+            self.assertEqual(str(board), self.render(board))
+            self.assertEqual(str(battleship.Cell('A', 1, part='Front')), 'A1[fo]')
+        finally:
+            tools.set_color_enabled(color_enabled)
+
+
 class ShipTest(unittest.TestCase):
     def setUp(self) -> None:
         self.ships = [battleship.Ship() for i in range(1, 10)]
@@ -113,6 +295,50 @@ class ShipTest(unittest.TestCase):
                 self.assertEqual(ship.rear.row, ship.middle.row)
 
 
+class PlacementTest(unittest.TestCase):
+    def test_placement_index(self):
+        # 8 columns x 6 middle rows vertical placements, 6 middle columns x 8 rows horizontal ones
+        self.assertEqual(len(battleship.PLACEMENT_CELLS), 96)
+        self.assertEqual(battleship.PLACEMENT_TYPES.count(battleship.Board.VERTICAL), 48)
+        self.assertEqual(len(set(battleship.PLACEMENT_MASKS)), 96)
+        self.assertEqual(sum(len(placements) for placements in battleship.PLACEMENTS_BY_CELL), 96 * 3)
+        for placement, cells in enumerate(battleship.PLACEMENT_CELLS):
+            for cell in cells:
+                self.assertIn(placement, battleship.PLACEMENTS_BY_CELL[cell])
+                self.assertTrue(battleship.PLACEMENT_BITS_BY_CELL[cell] >> placement & 1)
+
+    def test_ship_placement(self):
+        for placement in range(0, 96):
+            ship = battleship.Ship(placement=placement)
+            self.assertEqual(ship.placement, placement)
+            self.assertEqual(ship.type, battleship.PLACEMENT_TYPES[placement])
+
+        board = battleship.Board()
+        self.assertIsNone(board.placement)
+        board.place_ship()
+        self.assertEqual(board.placement, board.ship.placement)
+        self.assertEqual(board.ship_mask, battleship.PLACEMENT_MASKS[board.placement])
+
+    def test_placement_tracker(self):
+        tracker = battleship.PlacementTracker()
+        self.assertEqual(sum(tracker.counts), 96 * 3)
+        # D4 is covered by 3 vertical and 3 horizontal placements
+        self.assertEqual(tracker.counts[27], 6)
+        tracker.miss(27)
+        self.assertEqual(tracker.counts[27], 0)
+        self.assertEqual(sum(tracker.counts), 90 * 3)
+
+        # A1 hit: only the placements A1-A3 and A1-C1 remain
+        tracker.hit(0)
+        self.assertEqual(bin(tracker.alive).count('1'), 2)
+        self.assertEqual(tracker.counts[0], 2)
+        self.assertEqual(tracker.counts[1], 1)
+        self.assertEqual(tracker.counts[16], 1)
+        self.assertEqual(sum(tracker.counts), 6)
+        tracker.miss(1)
+        self.assertEqual(sum(tracker.counts), 3)
+
+
 class TestPlayer(unittest.TestCase):
     def setUp(self) -> None:
         self.player = battleship.Player()
@@ -172,6 +398,101 @@ class GameTest(unittest.TestCase):
         self.assertRaises(Exception, self.game.play_round)
         self.assertGreater(self.game.round, 4)
 
+    def test_seeded_game(self):
+        # Games sharing a seed draw the same ships, first shooter and shots
+        games = [battleship.Game(verbose=False, rng=random.Random(5)) for i in range(0, 2)]
+        for game in games:
+            while not game.is_over:
+                game.play_round()
+        self.assertEqual(games[0].round, games[1].round)
+        self.assertEqual(games[0].winner.name, games[1].winner.name)
+        self.assertEqual(games[0].shoots_first.name, games[1].shoots_first.name)
+        self.assertEqual(games[0].player_1.board.shots, games[1].player_1.board.shots)
+        self.assertEqual(games[0].player_2.board.ship_mask, games[1].player_2.board.ship_mask)
+
+    def test_play_without_replacement(self):
+        game = battleship.Game(verbose=False, rng=6, replacement=False)
+        game.play_round()
+        shots = 0
+        while not game.is_over:
+            game.play_round()
+            shots += 1
+            # One new cell shot on each board every round
+            self.assertEqual(bin(game.player_1.board.shots).count('1'), shots)
+            self.assertEqual(bin(game.player_2.board.shots).count('1'), shots)
+        self.assertLessEqual(game.round, 65)
+
+    def test_snapshot_restore(self):
+        game = battleship.Game(verbose=False, rng=14)
+        for i in range(0, 6):
+            game.play_round()
+        snapshot = game.snapshot()
+        last_hit = str(game.player_1.last_hit_cell)
+        while not game.is_over:
+            game.play_round()
+        final = game.snapshot()
+
+        game.restore(snapshot)
+        self.assertEqual(game.snapshot(), snapshot)
+        self.assertFalse(game.is_over)
+        self.assertIsNone(game.winner)
+        self.assertEqual(game.status, 'In Progress')
+        self.assertFalse(game.player_1.board.ship.sunk)
+        self.assertEqual(str(game.player_1.last_hit_cell), last_hit)
+        # The game can be played on from the restored state
+        game.play_round()
+        self.assertEqual(game.round, 7)
+
+        game.restore(final)
+        self.assertTrue(game.is_over)
+        self.assertTrue(game.loser.board.ship.sunk)
+        self.assertEqual(game.snapshot(), final)
+
+    def test_board_restore_placement(self):
+        board = battleship.Board(placement=0)
+        board.place_ship()
+        board.restore((1 << 40, battleship.PLACEMENT_MASKS[90]))
+        self.assertEqual(board.placement, 90)
+        self.assertEqual(board.ship.placement, 90)
+        self.assertEqual(board.shots, 1 << 40)
+        front = battleship.PLACEMENT_CELLS[90][0]
+        self.assertEqual(board.get_cell_at(front).part, 'Front')
+        self.assertIsNone(board.get_cell_at(battleship.PLACEMENT_CELLS[0][0]).part)
+        self.assertRaises(Exception, board.restore, (0, 0b1011))
+        board.restore((0, 0))
+        self.assertIsNone(board.placement)
+        self.assertFalse(any(board.parts))
+
+    def test_seed_rng(self):
+        # A seed works in place of a random.Random and replays the same game
+        games = [battleship.Game(verbose=False, rng=12) for i in range(0, 2)]
+        for game in games:
+            while not game.is_over:
+                game.play_round()
+        self.assertEqual(games[0].round, games[1].round)
+        self.assertEqual(games[0].player_1.board.shots, games[1].player_1.board.shots)
+
+        self.assertEqual(battleship.Board(rng=3).ship.middle.col, battleship.Board(rng=3).ship.middle.col)
+        self.assertEqual(battleship.Ship(rng=3).type, battleship.Ship(rng=3).type)
+
+    def test_bulk_shots(self):
+        # One getrandbits call draws 4 shots, sliced 6 bits at a time from the lowest ones
+        board = battleship.Board(rng=battleship.random.Random(5), placement=0, bulk_shots=4)
+        block = battleship.random.Random(5).getrandbits(24)
+        self.assertEqual([board.draw_random_index() for i in range(0, 4)], [block >> 6 * i & 63 for i in range(0, 4)])
+        self.assertTrue(all(0 <= board.draw_random_index() < 64 for i in range(0, 1000)))
+        # Without bulk shots the board draws like get_random_index
+        board = battleship.Board(rng=battleship.random.Random(5), placement=0)
+        self.assertEqual(board.draw_random_index(), battleship.Board.get_random_index(battleship.random.Random(5)))
+        self.assertRaises(Exception, battleship.Board, bulk_shots=-1)
+
+        games = [battleship.Game(verbose=False, rng=12, bulk_shots=32) for i in range(0, 2)]
+        for game in games:
+            while not game.is_over:
+                game.play_round()
+        self.assertEqual(games[0].player_2.board.shots, games[1].player_2.board.shots)
+        self.assertEqual(games[0].player_1.board.bulk_shots, 32)
+
 
 if __name__ == '__main__':
     unittest.main()
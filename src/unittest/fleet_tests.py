@@ -0,0 +1,73 @@
+import unittest
+import fleet
+import simulation
+
+
+class FleetBoardTest(unittest.TestCase):
+    def test_column_label(self):
+        self.assertEqual(fleet.column_label(0), 'A')
+        self.assertEqual(fleet.column_label(7), 'H')
+        self.assertEqual(fleet.column_label(26), 'AA')
+        self.assertEqual(fleet.column_label(702), 'AAA')
+        self.assertEqual(fleet.FleetBoard(30, 2).cell_label(31), 'B2')
+
+    def test_fleet_placement(self):
+        lengths = [5, 4, 3, 3, 2]
+        for seed in range(0, 50):
+            board = fleet.FleetBoard(10, 12, lengths, rng=seed)
+            self.assertEqual(sorted(len(ship) for ship in board.ships), sorted(lengths))
+            cells = [cell for ship in board.ships for cell in ship]
+            # Ships do not overlap and each one is a straight line inside the board
+            self.assertEqual(len(cells), len(set(cells)))
+            for ship in board.ships:
+                steps = {second - first for first, second in zip(ship, ship[1:])}
+                self.assertIn(steps, [{1}, {10}])
+                if steps == {1}:
+                    self.assertEqual(ship[0] // 10, ship[-1] // 10)
+                self.assertLess(ship[-1], 120)
+
+    def test_crowded_board(self):
+        # Every cell is taken, random tries fail and the free positions get enumerated
+        board = fleet.FleetBoard(5, 5, [5] * 5, rng=3)
+        self.assertEqual(len({cell for ship in board.ships for cell in ship}), 25)
+        self.assertRaises(Exception, fleet.FleetBoard, 5, 5, [5] * 6)
+        self.assertRaises(Exception, fleet.FleetBoard, 5, 5, [6])
+
+    def test_large_board(self):
+        board = fleet.FleetBoard(1000, 1000, [5, 4, 3, 3, 2] * 60, rng=1)
+        self.assertEqual(len(board.ships), 300)
+        self.assertEqual(board.afloat, 300)
+
+    def test_shoot(self):
+        board = fleet.FleetBoard(6, 6, [3, 2], rng=4)
+        for ship in board.ships:
+            for cell in ship:
+                self.assertFalse(board.is_ship_sunk(cell))
+                self.assertTrue(board.shoot(cell))
+                # Shooting the same cell twice changes nothing
+                self.assertTrue(board.shoot(cell))
+            self.assertTrue(board.is_ship_sunk(ship[0]))
+        self.assertTrue(board.sunk)
+
+    def test_simulate_fleet(self):
+        for strategy in [None, 'random', 'hunt_target', 'parity']:
+            result = fleet.simulate_fleet(20, 12, 9, [4, 3, 2], seed=2, replacement=False,
+                                          player_1_strategy=strategy, player_2_strategy='hunt_target')
+            self.assertEqual(result.games, 20)
+            self.assertLessEqual(max(result.rounds), 12 * 9)
+        self.assertRaises(Exception, fleet.simulate_fleet, 1, 10, 10, player_1_strategy='density')
+        # Classic-only strategies also refuse the classic board with any other fleet
+        for strategy in ['density', 'solver', 'input']:
+            for ships in [(3, 3), (2, 4)]:
+                self.assertRaises(Exception, fleet.play_fleet_game, fleet=ships, player_1_strategy=strategy)
+        result = fleet.simulate_fleet(5, seed=3, player_1_strategy='density')
+        self.assertEqual(result.games, 5)
+
+    def test_classic_fleet_matches_simulate(self):
+        result = fleet.simulate_fleet(2000, seed=6)
+        expected = simulation.simulate(20000, seed=6)
+        self.assertAlmostEqual(result.mean_rounds, expected.mean_rounds, delta=0.08 * expected.mean_rounds)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import io
+import unittest
+import battleship
+import live
+import tools
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LiveViewTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.game = battleship.Game(verbose=False, rng=4)
+        self.game.play_round()
+        self.stream = io.StringIO()
+        self.clock = FakeClock()
+        self.view = live.LiveView(self.game, self.stream, fps=10, clock=self.clock)
+
+    def frame(self, force=False):
+        self.stream.seek(0)
+        self.stream.truncate()
+        drawn = self.view.update(force)
+        return drawn, self.stream.getvalue()
+
+    def test_first_frame_draws_both_boards(self):
+        drawn, output = self.frame()
+        self.assertTrue(drawn)
+        self.assertIn(tools.Cursor.clear_screen, output)
+        self.assertEqual(output.count('['), 2 * 64 + output.count('\033['))
+
+    def test_diff_frame_redraws_changed_cells_only(self):
+        self.frame()
+        board = self.game.shoots_second.board
+        board.shoot(board.cell_index('C', 5))
+        self.clock.now += 1
+        drawn, output = self.frame()
+        self.assertTrue(drawn)
+        self.assertNotIn(tools.Cursor.clear_screen, output)
+        row, column = live.LiveView.cell_position(live.BOARD_LINES[1], board.cell_index('C', 5))
+        self.assertIn(tools.move_cursor(row, column) + board.render_cell(board.cell_index('C', 5)), output)
+        self.assertEqual(output.count('C5['), 1)
+        self.assertNotIn('C4[', output)
+
+    def test_frame_rate_cap(self):
+        self.frame()
+        self.clock.now += 0.05
+        self.assertFalse(self.frame()[0])
+        # Changes made during a skipped frame are drawn by the next one
+        board = self.game.shoots_first.board
+        board.shoot(board.cell_index('A', 1))
+        self.clock.now += 0.06
+        drawn, output = self.frame()
+        self.assertTrue(drawn)
+        self.assertIn('A1[', output)
+        self.assertTrue(self.frame(force=True)[0])
+
+    def test_watch(self):
+        game = battleship.Game(rng=8)
+        stream = io.StringIO()
+        view = live.watch(game, stream, fps=0)
+        self.assertTrue(game.is_over)
+        self.assertEqual(view.frames, game.round + 1)
+        self.assertTrue(stream.getvalue().endswith(tools.Cursor.show))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import os
+import pstats
+import tempfile
+import unittest
+import battleship
+import profiling
+
+
+def play(game):
+    while not game.is_over:
+        game.play_round()
+    return game
+
+
+class GameProfilerTest(unittest.TestCase):
+    def test_counts(self):
+        profiler = profiling.GameProfiler()
+        game = play(battleship.Game(verbose=False, rng=1, profiler=profiler))
+        self.assertIs(game.profiler, profiler)
+        rounds = game.round - 1
+        self.assertEqual(profiler.calls['placement'], 1)
+        self.assertEqual(profiler.calls['shoot'], 2 * rounds)
+        self.assertEqual(profiler.calls['win_check'], rounds + 1)
+        self.assertGreaterEqual(profiler.calls['sink'], rounds + 1)
+        self.assertEqual(profiler.calls['render'], 0)
+        repr(game)
+        self.assertEqual(profiler.calls['render'], 1)
+        self.assertGreater(profiler.seconds['shoot'], 0)
+
+    def test_shared_and_reset(self):
+        profiler = profiling.GameProfiler()
+        for seed in range(0, 3):
+            play(battleship.Game(verbose=False, rng=seed, profiler=profiler))
+        self.assertEqual(profiler.calls['placement'], 3)
+        profiler.reset()
+        self.assertEqual(profiler.calls['placement'], 0)
+        game = battleship.Game(verbose=False, rng=4, profiler=profiler)
+        game.play_round()
+        self.assertEqual(profiler.calls['placement'], 1)
+
+    def test_disabled(self):
+        game = battleship.Game(verbose=False, rng=1)
+        self.assertIsNone(game.profiler)
+        # Without a profiler the phases are the plain class methods
+        self.assertNotIn('shoot', vars(game))
+        self.assertEqual(game.place_ships.__func__, battleship.Game.place_ships)
+
+    def test_same_game(self):
+        # Timed phases play the same game as the plain ones
+        for seed in range(0, 10):
+            plain = play(battleship.Game(verbose=False, rng=seed))
+            profiled = play(battleship.Game(verbose=False, rng=seed, profiler=profiling.GameProfiler()))
+            self.assertEqual(plain.round, profiled.round)
+            self.assertEqual(plain.winner.name, profiled.winner.name)
+            self.assertEqual(plain.player_1.board.shots, profiled.player_1.board.shots)
+
+    def test_exports(self):
+        profiler = profiling.GameProfiler()
+        play(battleship.Game(verbose=False, rng=2, profiler=profiler))
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, 'stats.json')
+            profiler.to_json(json_path)
+            with open(json_path) as json_file:
+                stats = json.load(json_file)
+            self.assertEqual(stats['placement']['calls'], 1)
+            self.assertEqual(set(stats), set(profiling.PHASES))
+
+            stats_path = os.path.join(directory, 'game.prof')
+            profiler.dump_stats(stats_path)
+            loaded = pstats.Stats(stats_path)
+            calls = {name: values[1] for (filename, line, name), values in loaded.stats.items()}
+            self.assertEqual(calls['place_ships'], 1)
+            self.assertEqual(calls['shoot'], profiler.calls['shoot'])
+        self.assertRaises(Exception, profiler.wrap, 'nap', print)
+
+
+if __name__ == '__main__':
+    unittest.main()
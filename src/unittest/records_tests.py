@@ -0,0 +1,86 @@
+import os
+import random
+import tempfile
+import unittest
+import battleship
+import records
+
+
+def play(rng, recorder, **kwargs):
+    game = battleship.Game(verbose=False, rng=rng, recorder=recorder, **kwargs)
+    while not game.is_over:
+        game.play_round()
+    return game
+
+
+class RecordsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        handle, self.path = tempfile.mkstemp(suffix='.rec')
+        os.close(handle)
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+
+    def test_round_trip(self):
+        # 0xFFFF... seeds must not be mistaken for the end of the shots
+        seeds = [3, 2 ** 64 - 1, 0xFF]
+        with records.RecordWriter(self.path) as writer:
+            games = [play(seed, writer, player_1_name='Ånna', player_2_name='Bob') for seed in seeds]
+            self.assertEqual(writer.games, 3)
+
+        game_records = list(records.read_records(self.path))
+        self.assertEqual(len(game_records), 3)
+        for game, record in zip(games, game_records):
+            self.assertEqual(record.seed, game.seed)
+            self.assertEqual(record.names, ('Ånna', 'Bob'))
+            self.assertEqual(record.placements, (game.player_1.board.placement, game.player_2.board.placement))
+            self.assertEqual(record.first_shooter, 1 if game.shoots_first is game.player_1 else 2)
+            self.assertEqual(record.winner, 1 if game.winner is game.player_1 else 2)
+            self.assertEqual(record.rounds, game.round - 1)
+
+            # Shots alternate between the first and the second shooter's targets
+            first_target = game.shoots_second.board
+            second_target = game.shoots_first.board
+            self.assertEqual(sum(1 << shot for shot in set(record.shots[0::2])), first_target.shots)
+            self.assertEqual(sum(1 << shot for shot in set(record.shots[1::2])), second_target.shots)
+
+    def test_seed_unknown(self):
+        with records.RecordWriter(self.path) as writer:
+            play(random.Random(1), writer)
+        self.assertIsNone(next(records.read_records(self.path)).seed)
+
+    def test_seed_out_of_range(self):
+        # Seeds the header cannot hold as they are are recorded as unknown, the game is still recorded
+        seeds = [-1, 2 ** 64, 'seed', 1.5]
+        with records.RecordWriter(self.path) as writer:
+            games = [play(seed, writer) for seed in seeds]
+            self.assertEqual(writer.games, len(seeds))
+        for game, record in zip(games, records.read_records(self.path)):
+            self.assertIsNone(record.seed)
+            self.assertEqual(record.rounds, game.round - 1)
+            self.assertEqual(record.winner, records.player_number(game, game.winner))
+
+    def test_ship_not_placed(self):
+        with records.RecordWriter(self.path) as writer:
+            game = battleship.Game(verbose=False, rng=1, recorder=writer)
+            self.assertRaisesRegex(Exception, 'must be placed', writer.start_game, game)
+
+    def test_incomplete_record_is_ignored(self):
+        with records.RecordWriter(self.path) as writer:
+            play(1, writer)
+            play(2, writer)
+        with open(self.path, 'rb') as records_file:
+            data = records_file.read()
+        with open(self.path, 'wb') as records_file:
+            records_file.write(data[:-5])
+        self.assertEqual(len(list(records.read_records(self.path))), 1)
+
+    def test_empty_file(self):
+        self.assertEqual(list(records.read_records(self.path)), [])
+
+    def test_name_too_long(self):
+        self.assertRaises(Exception, records.encode_name, 'x' * 256)
+
+
+if __name__ == '__main__':
+    unittest.main()
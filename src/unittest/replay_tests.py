@@ -0,0 +1,76 @@
+import os
+import random
+import tempfile
+import unittest
+import battleship
+import records
+import replay
+import strategies
+
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self) -> None:
+        handle, path = tempfile.mkstemp(suffix='.rec')
+        os.close(handle)
+        # Shots masks of both boards after every round, as the game was played
+        self.history = []
+        with records.RecordWriter(path) as writer:
+            self.game = battleship.Game(verbose=False, rng=21, recorder=writer,
+                                        player_1_strategy=strategies.make_strategy('hunt_target'))
+            self.game.play_round()
+            self.history.append(self.state(self.game))
+            while not self.game.is_over:
+                self.game.play_round()
+                self.history.append(self.state(self.game))
+        self.record = next(records.read_records(path))
+        os.remove(path)
+
+    @staticmethod
+    def state(game):
+        return (game.player_1.board.shots, game.player_2.board.shots,
+                game.player_1.last_hit_index, game.player_2.last_hit_index, game.round, game.is_over)
+
+    def test_state_at_every_round(self):
+        for interval in [1, 5, 16]:
+            game_replay = replay.Replay(self.record, snapshot_interval=interval)
+            self.assertEqual(len(game_replay.snapshots), game_replay.rounds // interval + 1)
+            for round_number, expected in enumerate(self.history):
+                self.assertEqual(self.state(game_replay.state_at(round_number)), expected)
+
+    def test_final_state(self):
+        game_replay = replay.Replay(self.record)
+        game = game_replay.state_at(game_replay.rounds)
+        self.assertTrue(game.is_over)
+        self.assertEqual(game.winner.name, self.game.winner.name)
+        self.assertEqual(game.shoots_first.name, self.game.shoots_first.name)
+        self.assertEqual(game.player_1.board.placement, self.game.player_1.board.placement)
+        self.assertTrue(game.loser.board.ship.sunk)
+        self.assertRaises(Exception, game_replay.state_at, game_replay.rounds + 1)
+        self.assertRaises(Exception, replay.Replay, self.record, 0)
+
+    def test_global_random_untouched(self):
+        # A record without seed replays without drawing from the random module
+        seedless = records.GameRecord(None, self.record.first_shooter, self.record.placements, self.record.names,
+                                      self.record.shots, self.record.winner)
+        state = random.getstate()
+        game_replay = replay.Replay(seedless)
+        game_replay.state_at(game_replay.rounds // 2)
+        self.assertEqual(random.getstate(), state)
+
+    def test_bisect(self):
+        game_replay = replay.Replay(self.record, snapshot_interval=4)
+        loser = self.record.winner % 2 + 1
+
+        def loser_hit(game):
+            board = [game.player_1, game.player_2][loser - 1].board
+            return bool(board.shots & board.ship_mask)
+
+        # First round where the loser's ship got hit
+        ship_mask = self.game.loser.board.ship_mask
+        expected = next(round_number for round_number, state in enumerate(self.history) if state[loser - 1] & ship_mask)
+        self.assertEqual(game_replay.bisect(loser_hit), expected)
+        self.assertIsNone(game_replay.bisect(lambda game: False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+import battleship
+import server
+
+
+async def play_client(port, front, orientation):
+    """ Place a ship, fire at every cell in order until the game ends, return the outcome and the shots fired"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write('PLACE {} {}\n'.format(front, orientation).encode())
+    assert (await reader.readline()) == b'PLACED\n'
+    outcome = 'ONGOING'
+    shots = 0
+    for label in battleship.CELL_LABELS:
+        writer.write('FIRE {}\n'.format(label).encode())
+        words = (await reader.readline()).decode().split()
+        assert words[0] == 'SHOT' and words[1] == label, words
+        shots += 1
+        outcome = words[-1]
+        if outcome != 'ONGOING':
+            break
+    writer.write(b'QUIT\n')
+    assert (await reader.readline()) == b'BYE\n'
+    writer.close()
+    return outcome, shots
+
+
+class GameServerTest(unittest.TestCase):
+    def test_commands(self):
+        game_server = server.GameServer(rng=1)
+        session = server.Session()
+        self.assertEqual(game_server.command(session, 'FIRE A1'), 'ERROR no ship placed')
+        self.assertTrue(game_server.command(session, 'PLACE H1 H').startswith('ERROR Ship does not fit'))
+        self.assertTrue(game_server.command(session, 'PLACE Z9 V').startswith('ERROR Cell Z9'))
+        self.assertTrue(game_server.command(session, 'PLACE B4').startswith('ERROR usage'))
+        self.assertEqual(game_server.command(session, 'place b4 v'), 'PLACED')
+        self.assertEqual(game_server.command(session, 'PLACE A1 V'), 'ERROR game in progress')
+        self.assertEqual(session.state[2], (1 << 25) | (1 << 33) | (1 << 41))
+
+        words = game_server.command(session, 'FIRE C5').split()
+        self.assertEqual(words[:2], ['SHOT', 'C5'])
+        self.assertIn(words[3], battleship.CELL_LABELS)
+        self.assertEqual(session.state[0], 2)
+        self.assertEqual(session.state[3], 1 << battleship.CELL_LABELS.index('C5'))
+        self.assertTrue(game_server.command(session, 'FIRE C9').startswith('ERROR Cell C9'))
+        self.assertEqual(session.state[0], 2)
+        self.assertTrue(game_server.command(session, 'SHOUT').startswith('ERROR unknown'))
+        self.assertEqual(game_server.command(session, 'QUIT'), 'BYE')
+
+    def test_bot_never_repeats(self):
+        game_server = server.GameServer(rng=2)
+        session = server.Session()
+        game_server.command(session, 'PLACE A1 H')
+        bot_shots = set()
+        # Firing at the same cell forever, the bot sinks the ship within 64 rounds
+        for _ in range(64):
+            words = game_server.command(session, 'FIRE H8').split()
+            self.assertNotIn(words[3], bot_shots)
+            bot_shots.add(words[3])
+            if words[-1] != 'ONGOING':
+                break
+        self.assertEqual(words[-1], 'LOSE')
+        self.assertEqual(game_server.command(session, 'FIRE H8'), 'ERROR game over')
+        # A new game can start once the last one is over
+        self.assertEqual(game_server.command(session, 'PLACE A1 V'), 'PLACED')
+
+    def test_client_swarm(self):
+        async def swarm():
+            game_server = server.GameServer(rng=3)
+            tcp_server = await game_server.start()
+            port = tcp_server.sockets[0].getsockname()[1]
+            async with tcp_server:
+                clients = [play_client(port, battleship.CELL_LABELS[client % 48], 'V') for client in range(200)]
+                results = await asyncio.gather(*clients)
+                # Let the handlers see the disconnections
+                for _ in range(10):
+                    if not game_server.sessions:
+                        break
+                    await asyncio.sleep(0.01)
+            return game_server, results
+
+        game_server, results = asyncio.run(swarm())
+        self.assertEqual(len(results), 200)
+        self.assertEqual(game_server.games, 200)
+        self.assertEqual(game_server.sessions, 0)
+        for outcome, shots in results:
+            self.assertIn(outcome, ['WIN', 'LOSE'])
+            self.assertLessEqual(shots, 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
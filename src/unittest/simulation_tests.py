@@ -0,0 +1,72 @@
+import unittest
+import battleship
+import simulation
+
+
+class SimulationTest(unittest.TestCase):
+    def test_ship_mask(self):
+        rng = simulation.random.Random(7)
+        for i in range(0, 1000):
+            mask = simulation.random_ship_mask(rng)
+            cells = [index for index in range(simulation.CELL_COUNT) if mask >> index & 1]
+            self.assertEqual(len(cells), 3)
+            # Either 3 cells on the same row or 3 cells on the same column
+            rows = {index // 8 for index in cells}
+            cols = {index % 8 for index in cells}
+            self.assertTrue(len(rows) == 1 or len(cols) == 1)
+            self.assertTrue(len(rows) == 3 or len(cols) == 3)
+
+    def test_simulate(self):
+        result = simulation.simulate(2000, seed=1)
+        self.assertEqual(result.games, 2000)
+        self.assertEqual(sum(result.wins.values()), 2000)
+        self.assertEqual(sum(result.rounds.values()), 2000)
+        self.assertGreaterEqual(min(result.rounds), 3)
+        self.assertLessEqual(result.first_shooter_wins, 2000)
+
+    def test_simulate_is_reproducible(self):
+        first = simulation.simulate(500, seed=42)
+        second = simulation.simulate(500, seed=42)
+        self.assertEqual(first.rounds, second.rounds)
+        self.assertEqual(first.wins, second.wins)
+        self.assertEqual(first.first_shooter_wins, second.first_shooter_wins)
+
+    def test_simulate_games(self):
+        first = simulation.simulate_games(30, seed=4)
+        second = simulation.simulate_games(30, seed=4)
+        self.assertEqual(first.games, 30)
+        self.assertEqual(first.rounds, second.rounds)
+        self.assertEqual(first.wins, second.wins)
+
+    def test_simulate_without_replacement(self):
+        result = simulation.simulate(20000, seed=5, replacement=False)
+        self.assertEqual(result.games, 20000)
+        self.assertLessEqual(max(result.rounds), 64)
+        self.assertGreaterEqual(min(result.rounds), 3)
+
+        games = simulation.simulate_games(300, seed=5, replacement=False)
+        self.assertLessEqual(max(games.rounds), 64)
+        self.assertAlmostEqual(games.mean_rounds, result.mean_rounds, delta=0.1 * result.mean_rounds)
+        self.assertLess(result.mean_rounds, simulation.simulate(20000, seed=5).mean_rounds)
+
+    def test_merge(self):
+        merged = simulation.simulate(300, seed=1).merge(simulation.simulate(200, seed=2))
+        self.assertEqual(merged.games, 500)
+        self.assertEqual(sum(merged.rounds.values()), 500)
+
+    def test_matches_game(self):
+        rounds = []
+        for i in range(0, 300):
+            game = battleship.Game(verbose=False)
+            while not game.is_over:
+                game.play_round()
+            # Round 0 is ship placement, round counter is one past the last round played
+            rounds.append(game.round - 1)
+
+        result = simulation.simulate(3000, seed=3)
+        game_mean = sum(rounds) / len(rounds)
+        self.assertAlmostEqual(game_mean, result.mean_rounds, delta=0.15 * result.mean_rounds)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import battleship
+import simulation
+import solver
+import strategies
+
+
+class StepClock:
+    """ Clock moving forward by a fixed step every time it is read"""
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class MonteCarloSolverTest(unittest.TestCase):
+    def test_candidates(self):
+        self.assertEqual(len(solver.MonteCarloSolver.candidates(0, 0)), 96)
+        # A hit on A1 leaves one vertical and one horizontal placement, a miss on B1 rules out the horizontal one
+        self.assertEqual(len(solver.MonteCarloSolver.candidates(1 << 0, 0)), 2)
+        self.assertEqual(solver.MonteCarloSolver.candidates(1 << 0, 1 << 1),
+                         [battleship.PLACEMENT_IDS[(0, 8, 16)]])
+        self.assertRaises(Exception, solver.MonteCarloSolver().solve, 1 << 0, (1 << 1) | (1 << 8))
+
+    def test_hit_probability(self):
+        monte_carlo = solver.MonteCarloSolver(rng=1)
+        # After a hit on D4 and misses above and below it, the ship lies on row 4: 3 placements, counted exactly
+        result = monte_carlo.solve(1 << 27, (1 << 19) | (1 << 35))
+        self.assertIn(result.shot, [26, 28])
+        self.assertEqual(result.samples, 3)
+        self.assertAlmostEqual(result.hit_probability(26), 2 / 3)
+        self.assertAlmostEqual(result.hit_probability(25), 1 / 3)
+        self.assertEqual(result.hit_probability(19), 0.0)
+        # With no shot yet every placement counts, D4 is covered by 6 of the 96
+        self.assertEqual(monte_carlo.solve(0, 0).hit_counts[27], 6)
+
+    def test_sampling(self):
+        # Budget large enough that the sample cap stops sampling, even on a loaded machine
+        monte_carlo = solver.MonteCarloSolver(budget_ms=60000, max_samples=2000, exact_limit=0, rng=1)
+        result = monte_carlo.solve(1 << 27, (1 << 19) | (1 << 35))
+        self.assertIn(result.shot, [26, 28])
+        self.assertEqual(result.samples, 2000)
+        self.assertAlmostEqual(result.hit_probability(26) + result.hit_probability(28), 4 / 3, places=1)
+
+    def test_budget_stops_sampling(self):
+        # Every clock read moves 1ms forward, so the 2ms budget is spent after the first batch or two
+        monte_carlo = solver.MonteCarloSolver(budget_ms=2, batch_size=8, clock=StepClock(0.001), rng=1,
+                                              exact_limit=0)
+        result = monte_carlo.solve(0, 0)
+        self.assertLessEqual(result.samples, 16)
+        self.assertGreater(result.samples, 0)
+
+    def test_remaining_shots(self):
+        monte_carlo = solver.MonteCarloSolver(objective=solver.REMAINING_SHOTS, max_rollouts=64, rng=1)
+        result = monte_carlo.solve(1 << 27, (1 << 19) | (1 << 35))
+        self.assertEqual(len(result.expected_shots), solver.ROLLOUT_CANDIDATES)
+        self.assertIn(result.shot, [26, 28])
+        # The ship still has 2 parts afloat, so at least 2 shots are needed
+        self.assertGreaterEqual(result.expected_shots[result.shot], 2)
+        self.assertRaises(Exception, solver.MonteCarloSolver, objective='luck')
+        self.assertRaises(Exception, solver.MonteCarloSolver, objective=solver.REMAINING_SHOTS, max_rollouts=0)
+        self.assertRaises(Exception, solver.MonteCarloSolver, max_samples=0)
+
+    def test_rollout(self):
+        ship = battleship.PLACEMENT_MASKS[battleship.PLACEMENT_IDS[(0, 1, 2)]]
+        tracker = battleship.PlacementTracker()
+        # Shooting A1 then following the density sinks the ship on A1-C1 in 3 to 4 shots
+        self.assertIn(solver.MonteCarloSolver.rollout(tracker, 0, ship, 0), [3, 4])
+
+    def test_solver_strategy(self):
+        for seed in range(0, 5):
+            game = battleship.Game(verbose=False, rng=seed,
+                                   player_1_strategy=strategies.make_strategy('solver', rng=seed))
+            while not game.is_over:
+                game.play_round()
+            self.assertEqual(bin(game.player_2.board.shots).count('1'), game.round - 1)
+            self.assertIsNotNone(game.player_1.strategy.last_result)
+
+    def test_solver_strategy_reproducible(self):
+        # Without an rng of its own, the solver draws from the seeded game, so seeded runs repeat
+        runs = [simulation.simulate_games(5, seed=8, player_1_strategy='solver') for _ in range(2)]
+        self.assertEqual(runs[0].rounds, runs[1].rounds)
+        self.assertEqual(runs[0].wins, runs[1].wins)
+
+
+if __name__ == '__main__':
+    unittest.main()
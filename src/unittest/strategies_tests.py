@@ -0,0 +1,115 @@
+import unittest
+import battleship
+import strategies
+
+
+def play(strategy_name, seed):
+    game = battleship.Game(verbose=False, rng=seed,
+                           player_1_strategy=strategies.make_strategy(strategy_name),
+                           player_2_strategy=strategies.make_strategy(strategy_name))
+    while not game.is_over:
+        game.play_round()
+    return game
+
+
+class StrategyTest(unittest.TestCase):
+    def test_neighbors(self):
+        self.assertEqual(strategies.neighbor_indexes(0, 8, 8), [8, 1])
+        self.assertEqual(sorted(strategies.neighbor_indexes(9, 8, 8)), [1, 8, 10, 17])
+
+    def test_cell_pool(self):
+        pool = strategies.CellPool(range(0, 10), 10)
+        pool.remove(3)
+        pool.remove(3)
+        self.assertNotIn(3, pool)
+        drawn = [pool.draw(battleship.random.Random(1)) for i in range(0, 9)]
+        self.assertEqual(sorted(drawn), [0, 1, 2, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(len(pool), 0)
+
+    def test_make_strategy(self):
+        strategy = strategies.HuntTargetStrategy()
+        self.assertIs(strategies.make_strategy(strategy), strategy)
+        self.assertIsInstance(strategies.make_strategy('density'), strategies.ProbabilityDensityStrategy)
+        self.assertRaises(Exception, strategies.make_strategy, 'cheat')
+
+    def test_smart_strategies_never_repeat_shots(self):
+        for name in ['hunt_target', 'parity', 'density']:
+            for seed in range(0, 20):
+                game = play(name, seed)
+                # No repeated shot, so the number of cells shot grows by one each round
+                self.assertEqual(bin(game.player_1.board.shots).count('1'), game.round - 1)
+                self.assertLessEqual(game.round - 1, 64)
+
+    def test_density_counts(self):
+        strategy = strategies.ProbabilityDensityStrategy()
+        # A1 is covered by one vertical and one horizontal placement, D4 by 3 of each
+        self.assertEqual(strategy.counts[0], 2)
+        self.assertEqual(strategy.counts[27], 6)
+        strategy.observe(27, False, False)
+        self.assertEqual(strategy.counts[27], 0)
+        self.assertEqual(strategy.counts[28], 4)
+        # A hit keeps only the placements covering the hit cell
+        strategy.observe(0, True, False)
+        self.assertEqual(strategy.counts[1], 1)
+        self.assertEqual(strategy.counts[8], 1)
+        self.assertEqual(strategy.counts[28], 0)
+
+    def test_ranked_tracker(self):
+        def ranked(tracker):
+            return [sum(1 << cell for cell, count in enumerate(tracker.counts) if count == bucket)
+                    for bucket in range(len(tracker.buckets))]
+
+        tracker = strategies.RankedPlacementTracker()
+        self.assertEqual(tracker.buckets, ranked(tracker))
+        for cell in [27, 5, 40]:
+            tracker.miss(cell)
+            self.assertEqual(tracker.buckets, ranked(tracker))
+        # First hit counts the survivors again, the second one discounts the few ruled out
+        copy = tracker.copy()
+        for cell in [0, 1]:
+            copy.hit(cell)
+            self.assertEqual(copy.buckets, ranked(copy))
+        self.assertEqual(tracker.buckets, ranked(tracker))
+
+    def test_input_strategy(self):
+        human = strategies.make_strategy('input')
+        game = battleship.Game(verbose=False, rng=4, player_1_strategy=human)
+        # Nothing happens until the ship is placed, then until a shot is queued
+        self.assertFalse(game.play_round())
+        self.assertEqual(game.round, 0)
+        self.assertRaises(Exception, human.feed, 'H1 H')
+        human.feed('h1 v')
+        self.assertTrue(game.play_round())
+        self.assertEqual(game.player_1.board.ship_mask, (1 << 7) | (1 << 15) | (1 << 23))
+        self.assertFalse(game.play_round())
+        self.assertEqual(game.round, 1)
+
+        for label in battleship.CELL_LABELS:
+            human.feed(label)
+        self.assertEqual(human.pending, 64)
+        while not game.is_over:
+            self.assertTrue(game.play_round())
+        self.assertEqual(human.pending, 64 - (game.round - 1))
+        self.assertRaises(Exception, human.feed, 'A1 B2 C3')
+
+        # A strategy set after the game was created waits for input too
+        game = battleship.Game(verbose=False, rng=4)
+        self.assertFalse(game.player_1.interactive)
+        game.player_1.strategy = strategies.make_strategy('input')
+        self.assertTrue(game.player_1.interactive)
+        self.assertFalse(game.play_round())
+        self.assertFalse(battleship.Game(verbose=False, player_2_strategy=strategies.make_strategy('density'))
+                         .player_2.interactive)
+
+    def test_smart_strategies_beat_random(self):
+        wins = 0
+        for seed in range(0, 40):
+            game = battleship.Game(verbose=False, rng=seed, player_1_strategy=strategies.make_strategy('density'))
+            while not game.is_over:
+                game.play_round()
+            wins += game.winner is game.player_1
+        self.assertGreater(wins, 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import io
+import random
+import unittest
+import tools
+
+
+class RngTest(unittest.TestCase):
+    def test_make_rng(self):
+        self.assertIs(tools.make_rng(), random)
+        rng = random.Random(1)
+        self.assertIs(tools.make_rng(rng), rng)
+        self.assertEqual(tools.make_rng(3).random(), random.Random(3).random())
+
+    def test_draw_unshot(self):
+        pool = list(range(0, 10))
+        # Cell 4 was shot since the pool was built, it is never drawn
+        drawn = [tools.draw_unshot(pool, random.Random(2), lambda index: index == 4) for i in range(0, 9)]
+        self.assertEqual(sorted(drawn), [0, 1, 2, 3, 5, 6, 7, 8, 9])
+        self.assertEqual(pool, [])
+        self.assertIsNone(tools.draw_unshot(pool, random.Random(2), lambda index: False))
+
+
+class ColorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.color_enabled = tools.color_enabled
+
+    def tearDown(self) -> None:
+        tools.set_color_enabled(self.color_enabled)
+
+    def test_cell_print(self):
+        tools.set_color_enabled(True)
+        for part_letter in ['n', 'f']:
+            for hit in [False, True]:
+                mark = tools.colored('x', 'red') if hit else tools.colored('o', 'green')
+                expected = 'B2[{}{}]'.format(part_letter, mark)
+                if part_letter != 'n':
+                    expected = tools.colored(tools.colored_background(expected, 'orange'), 'blue')
+                self.assertEqual(tools.format_cell_print('B2', part_letter, hit, part_letter != 'n'), expected)
+        self.assertEqual(tools.format_cell_print('B2', 'f', True, True, color=False), 'B2[fx]')
+
+    def test_cell_print_table(self):
+        table = tools.build_cell_prints(['A1', 'B1'], ['n', 'f'], color=False)
+        self.assertEqual(table[1][1][True], 'B1[fx]')
+        self.assertEqual(table[0][0][False], 'A1[no]')
+
+    def test_no_color(self):
+        self.assertFalse(tools.stream_supports_color(io.StringIO()))
+        tools.set_color_enabled(False)
+        self.assertEqual(tools.colored('x', 'red'), 'x')
+        self.assertEqual(tools.colored_background('x', 'red'), 'x')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+import tournament
+
+
+class TournamentTest(unittest.TestCase):
+    def test_shards(self):
+        self.assertEqual(tournament.shard_sizes(25, 10), [10, 10, 5])
+        self.assertEqual(tournament.shard_sizes(20, 10), [10, 10])
+        self.assertEqual(tournament.shard_seeds(3, 4), tournament.shard_seeds(3, 4))
+        self.assertEqual(len(set(tournament.shard_seeds(3, 4))), 4)
+        self.assertRaises(Exception, tournament.shard_sizes, 10, 0)
+
+    def test_same_result_whatever_the_worker_count(self):
+        single = tournament.run_tournament(3000, seed=9, workers=1, shard_size=400)
+        pooled = tournament.run_tournament(3000, seed=9, workers=3, shard_size=400)
+        self.assertEqual(single.games, 3000)
+        self.assertEqual(single.rounds, pooled.rounds)
+        self.assertEqual(single.wins, pooled.wins)
+        self.assertEqual(single.first_shooter_wins, pooled.first_shooter_wins)
+
+    def test_game_engine(self):
+        single = tournament.run_tournament(40, seed=2, workers=1, shard_size=15, engine='game')
+        pooled = tournament.run_tournament(40, seed=2, workers=2, shard_size=15, engine='game')
+        self.assertEqual(single.games, 40)
+        self.assertEqual(single.rounds, pooled.rounds)
+        self.assertRaises(Exception, tournament.run_tournament, 10, engine='unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
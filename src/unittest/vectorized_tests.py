@@ -0,0 +1,57 @@
+import random
+import unittest
+import battleship
+import vectorized
+
+
+def ks_statistic(first, second):
+    """ Largest distance between the cumulative distributions of two rounds histograms"""
+    first_total = sum(first.values())
+    second_total = sum(second.values())
+    first_cdf = second_cdf = distance = 0.0
+    for rounds in sorted(set(first) | set(second)):
+        first_cdf += first.get(rounds, 0) / first_total
+        second_cdf += second.get(rounds, 0) / second_total
+        distance = max(distance, abs(first_cdf - second_cdf))
+    return distance
+
+
+@unittest.skipIf(vectorized.numpy is None, 'numpy is not installed')
+class VectorizedTest(unittest.TestCase):
+    def test_ship_masks(self):
+        rng = vectorized.numpy.random.default_rng(5)
+        for mask in vectorized.random_ship_masks(2000, rng).tolist():
+            cells = [index for index in range(64) if mask >> index & 1]
+            self.assertEqual(len(cells), 3)
+            rows = {index // 8 for index in cells}
+            cols = {index % 8 for index in cells}
+            self.assertTrue(len(rows) == 1 and cells[2] - cells[0] == 2 or len(cols) == 1 and cells[2] - cells[0] == 16)
+
+    def test_simulate(self):
+        result = vectorized.simulate_vectorized(5000, seed=1, batch_size=1500)
+        self.assertEqual(result.games, 5000)
+        self.assertEqual(sum(result.wins.values()), 5000)
+        self.assertEqual(sum(result.rounds.values()), 5000)
+
+        again = vectorized.simulate_vectorized(5000, seed=1, batch_size=1500)
+        self.assertEqual(result.rounds, again.rounds)
+
+    def test_matches_game(self):
+        random.seed(11)
+        game_rounds = {}
+        games = 600
+        for i in range(0, games):
+            game = battleship.Game(verbose=False)
+            while not game.is_over:
+                game.play_round()
+            game_rounds[game.round - 1] = game_rounds.get(game.round - 1, 0) + 1
+
+        result = vectorized.simulate_vectorized(50000, seed=11)
+        # Kolmogorov-Smirnov critical value at alpha = 0.001
+        critical = 1.95 * ((games + result.games) / (games * result.games)) ** 0.5
+        self.assertLess(ks_statistic(game_rounds, result.rounds), critical)
+        self.assertAlmostEqual(result.first_shooter_win_rate, 0.5, delta=0.02)
+
+
+if __name__ == '__main__':
+    unittest.main()